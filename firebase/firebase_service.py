@@ -147,7 +147,6 @@ class FirebaseService:
         scan_data = {
             'timestamp': timestamp,
             'summary': results['summary'],
-            'vulnerabilities': results['vulnerabilities'],
             'scanned_links': results['scanned_links'],
             'scanned_forms': results['scanned_forms'],
             'scanned_urls': results.get('scanned_urls', []),
@@ -155,6 +154,10 @@ class FirebaseService:
             'endTime': timestamp
         }
         
+        # Vulnerabilities may already have been streamed with save_vulnerabilities_batch
+        if 'vulnerabilities' in results:
+            scan_data['vulnerabilities'] = results['vulnerabilities']
+        
         # Save to Firebase
         try:
             # If no scan_id is provided, generate one
@@ -178,6 +181,34 @@ class FirebaseService:
                 'message': 'Failed to save scan results to Firebase'
             }
     
+    def save_vulnerabilities_batch(self, scan_id, start_index, vulnerabilities):
+        """Append a batch of vulnerabilities to a scan with a single multi-path update"""
+        if not self.initialized:
+            self.initialize()
+            if not self.initialized:
+                return {
+                    'success': False,
+                    'message': 'Firebase not initialized'
+                }
+        
+        try:
+            # Index keys keep the node readable as a list, like a full save would
+            vulns_ref = self.db.child('scans').child(scan_id).child('vulnerabilities')
+            vulns_ref.update({
+                str(start_index + offset): vuln
+                for offset, vuln in enumerate(vulnerabilities)
+            })
+            return {
+                'success': True,
+                'message': f'{len(vulnerabilities)} vulnerabilities saved'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to save vulnerabilities batch'
+            }
+    
     def get_scan_results(self, scan_id):
         """Get scan results from Firebase"""
         if not self.initialized:
@@ -78,6 +78,11 @@ class ScannerConfig:
             
             # Rate limiting
             'rate_limit': 0,  # requests per second, 0 for no limit
+            'probe_rate': 2.0,  # sustained vulnerability probes per second, 0 for no limit
+            'probe_burst': 5,  # probes that may be sent back to back
+            
+            # DNS answers are reused for this many seconds, 0 to disable the cache
+            'dns_cache_ttl': 900,
             
             # Excluded paths
             'excluded_paths': [],
@@ -129,7 +134,10 @@ class ScannerConfig:
             'SCANNER_AUTH_PASSWORD': ('auth_password', str),
             'SCANNER_USE_PROXY': ('use_proxy', bool),
             'SCANNER_PROXY_URL': ('proxy_url', str),
-            'SCANNER_RATE_LIMIT': ('rate_limit', int)
+            'SCANNER_RATE_LIMIT': ('rate_limit', int),
+            'SCANNER_PROBE_RATE': ('probe_rate', float),
+            'SCANNER_PROBE_BURST': ('probe_burst', int),
+            'SCANNER_DNS_CACHE_TTL': ('dns_cache_ttl', float)
         }
         
         for env_var, (config_key, type_cast) in env_mapping.items():
@@ -7,9 +7,12 @@ from utils import is_same_domain, is_valid_link
 from scanner.forms import extract_forms
 from scanner.session import CustomSession
 from scanner.sqli import SQLiScanner
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from tldextract import extract
 
+# Only links are read from each page, so nothing else is built into the soup
+_LINK_TAGS = SoupStrainer("a", href=True)
+
 class WebCrawler:
     def __init__(self, base_url):
         self.base_url = base_url
@@ -85,7 +88,7 @@ class WebCrawler:
                         print(f"[!] Found vulnerable {form['method'].upper()} parameter: {input_field['name']} in {form_url}")
 
             # Extract and queue new links
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(response.text, "html.parser", parse_only=_LINK_TAGS)
             for tag in soup.find_all("a", href=True):
                 link = urljoin(url, tag['href'])
                 if is_valid_link(link) and is_same_domain(link, self.base_url):
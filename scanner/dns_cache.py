@@ -0,0 +1,60 @@
+"""
+Process-wide DNS cache for the scanner's outgoing requests
+"""
+import socket
+import threading
+import time
+from typing import Dict, Tuple
+
+# Seconds a resolved address is reused before it is looked up again
+DEFAULT_TTL = 900
+
+# Resolved hosts kept at once; the cache is emptied when it grows past this
+MAX_ENTRIES = 1024
+
+_original_getaddrinfo = socket.getaddrinfo
+_cache: Dict[tuple, Tuple[float, list]] = {}
+_lock = threading.Lock()
+_ttl = DEFAULT_TTL
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo replacement that reuses recent answers"""
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+
+    entry = _cache.get(key)
+    if entry is not None and now - entry[0] < _ttl:
+        return list(entry[1])
+
+    # Failures are not cached - they raise before reaching the store below
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _lock:
+        if len(_cache) >= MAX_ENTRIES:
+            _cache.clear()
+        _cache[key] = (now, result)
+    return list(result)
+
+
+def install_dns_cache(ttl: float = DEFAULT_TTL) -> None:
+    """
+    Route socket.getaddrinfo through the cache
+
+    Every library built on the socket module (requests/urllib3, aiohttp's
+    default resolver, httpx) then resolves each host once per ttl seconds.
+    Calling it again only updates the ttl; a ttl of 0 or less uninstalls it.
+    """
+    global _ttl
+    if ttl <= 0:
+        uninstall_dns_cache()
+        return
+
+    _ttl = ttl
+    socket.getaddrinfo = _cached_getaddrinfo
+
+
+def uninstall_dns_cache() -> None:
+    """Restore the original socket.getaddrinfo and drop all cached answers"""
+    socket.getaddrinfo = _original_getaddrinfo
+    with _lock:
+        _cache.clear()
@@ -1,9 +1,12 @@
 # crawler/forms.py
 
 from typing import List, Dict, Union
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import requests
 
+# Only form subtrees are built into the soup
+_FORM_TAGS = SoupStrainer("form")
+
 def extract_forms(response: Union[str, requests.Response]) -> List[Dict]:
     """Extract forms from HTML content or response object"""
     if isinstance(response, requests.Response):
@@ -11,7 +14,7 @@ def extract_forms(response: Union[str, requests.Response]) -> List[Dict]:
     else:
         html = response
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "html.parser", parse_only=_FORM_TAGS)
     forms = []
 
     for form in soup.find_all("form"):
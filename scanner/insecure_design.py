@@ -5,7 +5,10 @@ from typing import Dict, List, Any
 import requests
 import re
 import time
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Only meta tags are built into the soup when looking for CSRF tokens
+_META_TAGS = SoupStrainer('meta')
 
 def check_csrf_protection(form: Dict[str, Any], response_text: str) -> bool:
     """
@@ -32,7 +35,7 @@ def check_csrf_protection(form: Dict[str, Any], response_text: str) -> bool:
             return True
     
     # Check for hidden meta tags with CSRF tokens
-    soup = BeautifulSoup(response_text, 'html.parser')
+    soup = BeautifulSoup(response_text, 'html.parser', parse_only=_META_TAGS)
     meta_tags = soup.find_all('meta')
     
     for tag in meta_tags:
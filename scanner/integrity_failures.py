@@ -3,8 +3,9 @@ A08 - Software and Data Integrity Failures Scanner Module
 """
 from typing import Dict, List, Any, Optional
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+from urllib.parse import urljoin
 
 def check_integrity_failures(url: str, response: requests.Response, log_func=None) -> List[Dict[str, Any]]:
     """
@@ -102,6 +103,9 @@ def check_integrity_failures(url: str, response: requests.Response, log_func=Non
     
     return vulnerabilities
 
+# Only script tags with a src are built into the soup
+_SCRIPT_TAGS = SoupStrainer('script', src=True)
+
 def extract_scripts(response: requests.Response) -> List[tuple]:
     """
     Extract script tags and check for integrity attributes
@@ -113,9 +117,10 @@ def extract_scripts(response: requests.Response) -> List[tuple]:
         List of tuples (script_url, has_integrity)
     """
     scripts = []
+    base_url = response.url
     
     try:
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.text, 'html.parser', parse_only=_SCRIPT_TAGS)
         
         for script in soup.find_all('script', src=True):
             script_url = script.get('src', '')
@@ -123,8 +128,7 @@ def extract_scripts(response: requests.Response) -> List[tuple]:
             
             # Normalize the URL if it's relative
             if script_url and not script_url.startswith(('http://', 'https://', '//')):
-                from urllib.parse import urljoin
-                script_url = urljoin(response.url, script_url)
+                script_url = urljoin(base_url, script_url)
             elif script_url.startswith('//'):
                 # Protocol-relative URL, add https:
                 script_url = 'https:' + script_url
@@ -7,6 +7,76 @@ import re
 import time
 import random
 
+def _compile_any(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """Compile a list of patterns into one case-insensitive alternation"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE | flags)
+
+# Patterns are compiled once with re.IGNORECASE so response bodies never need a lowercased copy
+_LOGIN_PAGE_RE = _compile_any([
+    r'<form[^>]*>.*?(?:<input[^>]*password[^>]*>).*?</form>',
+    r'login|signin|log in|sign in',
+    r'username|user name|email|e-mail',
+    r'password|passcode|pin'
+], re.DOTALL)
+
+_LOCKOUT_RE = _compile_any([
+    r'account.*lock|lock.*account',
+    r'too many attempts|maximum attempts',
+    r'temporarily disabled|temporarily blocked',
+    r'try again later|wait \d+ minute'
+])
+
+_LOGIN_MONITORING_RE = _compile_any([
+    r'unusual activity|suspicious activity',
+    r'security alert|security notification',
+    r'multiple failed attempts|repeated failed'
+])
+
+_AUDIT_TRAIL_RE = _compile_any([
+    r'audit log|audit trail',
+    r'user activity|activity log',
+    r'last login|previous login',
+    r'session history|login history'
+])
+
+_ADMIN_URL_RE = _compile_any([
+    r'/admin',
+    r'/administrator',
+    r'/manage',
+    r'/dashboard',
+    r'/control',
+    r'/panel',
+    r'/console'
+])
+
+_ADMIN_CONTENT_RE = _compile_any([
+    r'admin dashboard|admin panel',
+    r'control panel|management console',
+    r'administrative tools|admin tools',
+    r'manage users|user management',
+    r'site administration|website admin'
+])
+
+_PROPER_LOGGING_RE = _compile_any([
+    r'activity log|action log',
+    r'audit trail|audit log',
+    r'logging enabled|logs enabled',
+    r'event tracking|event logging'
+])
+
+_SUSPICIOUS_MONITORING_RE = _compile_any([
+    r'unusual activity|suspicious activity',
+    r'security alert|security warning',
+    r'abnormal behavior|anomalous behavior',
+    r'activity monitoring|behavior monitoring'
+])
+
+_CENTRALIZED_LOGGING_RE = _compile_any([
+    r'log aggregation|log collection',
+    r'centralized logging|unified logging',
+    r'log management|log system'
+])
+
 def check_logging_monitoring(url: str, response: requests.Response, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
     """
     Check for security logging and monitoring failures
@@ -106,21 +176,8 @@ def is_login_page(response: requests.Response) -> bool:
     Returns:
         True if the page is a login page, False otherwise
     """
-    content = response.text.lower()
-    
     # Look for patterns that suggest a login page
-    login_patterns = [
-        r'<form[^>]*>.*?(?:<input[^>]*password[^>]*>).*?</form>',
-        r'login|signin|log in|sign in',
-        r'username|user name|email|e-mail',
-        r'password|passcode|pin'
-    ]
-    
-    for pattern in login_patterns:
-        if re.search(pattern, content, re.DOTALL):
-            return True
-    
-    return False
+    return _LOGIN_PAGE_RE.search(response.text) is not None
 
 def test_login_monitoring(url: str, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
     """
@@ -177,31 +234,9 @@ def test_login_monitoring(url: str, session: requests.Session, log_func=None) ->
                 login_response = session.post(form_action, data=login_data, allow_redirects=True)
                 
                 # Check if we get any indication of account lockout or monitoring
-                has_lockout = False
-                has_monitoring = False
-                
-                lockout_patterns = [
-                    r'account.*lock|lock.*account',
-                    r'too many attempts|maximum attempts',
-                    r'temporarily disabled|temporarily blocked',
-                    r'try again later|wait \d+ minute'
-                ]
-                
-                monitoring_patterns = [
-                    r'unusual activity|suspicious activity',
-                    r'security alert|security notification',
-                    r'multiple failed attempts|repeated failed'
-                ]
-                
-                for pattern in lockout_patterns:
-                    if re.search(pattern, login_response.text.lower()):
-                        has_lockout = True
-                        break
-                
-                for pattern in monitoring_patterns:
-                    if re.search(pattern, login_response.text.lower()):
-                        has_monitoring = True
-                        break
+                login_text = login_response.text
+                has_lockout = _LOCKOUT_RE.search(login_text) is not None
+                has_monitoring = _LOGIN_MONITORING_RE.search(login_text) is not None
                 
                 # If we got locked out, no need to continue
                 if has_lockout:
@@ -256,21 +291,8 @@ def missing_audit_trail(response: requests.Response) -> bool:
     Returns:
         True if audit trails are missing, False if they are present
     """
-    content = response.text.lower()
-    
     # Look for patterns that suggest audit trails
-    audit_patterns = [
-        r'audit log|audit trail',
-        r'user activity|activity log',
-        r'last login|previous login',
-        r'session history|login history'
-    ]
-    
-    for pattern in audit_patterns:
-        if re.search(pattern, content):
-            return False
-    
-    return True
+    return _AUDIT_TRAIL_RE.search(response.text) is None
 
 def is_admin_page(url: str, response: requests.Response) -> bool:
     """
@@ -284,35 +306,11 @@ def is_admin_page(url: str, response: requests.Response) -> bool:
         True if the page is an admin page, False otherwise
     """
     # Check URL for admin indicators
-    admin_url_patterns = [
-        r'/admin',
-        r'/administrator',
-        r'/manage',
-        r'/dashboard',
-        r'/control',
-        r'/panel',
-        r'/console'
-    ]
-    
-    for pattern in admin_url_patterns:
-        if re.search(pattern, url.lower()):
-            return True
+    if _ADMIN_URL_RE.search(url):
+        return True
     
     # Check content for admin indicators
-    content = response.text.lower()
-    admin_content_patterns = [
-        r'admin dashboard|admin panel',
-        r'control panel|management console',
-        r'administrative tools|admin tools',
-        r'manage users|user management',
-        r'site administration|website admin'
-    ]
-    
-    for pattern in admin_content_patterns:
-        if re.search(pattern, content):
-            return True
-    
-    return False
+    return _ADMIN_CONTENT_RE.search(response.text) is not None
 
 def has_proper_logging(response: requests.Response) -> bool:
     """
@@ -324,21 +322,8 @@ def has_proper_logging(response: requests.Response) -> bool:
     Returns:
         True if proper logging is detected, False otherwise
     """
-    content = response.text.lower()
-    
     # Look for patterns that suggest proper logging
-    logging_patterns = [
-        r'activity log|action log',
-        r'audit trail|audit log',
-        r'logging enabled|logs enabled',
-        r'event tracking|event logging'
-    ]
-    
-    for pattern in logging_patterns:
-        if re.search(pattern, content):
-            return True
-    
-    return False
+    return _PROPER_LOGGING_RE.search(response.text) is not None
 
 def lacks_suspicious_activity_monitoring(url: str, session: requests.Session, log_func=None) -> bool:
     """
@@ -370,18 +355,8 @@ def lacks_suspicious_activity_monitoring(url: str, session: requests.Session, lo
         
         # 3. Check the last response for any indication of monitoring
         response = session.get(url, timeout=2)
-        content = response.text.lower()
-        
-        monitoring_patterns = [
-            r'unusual activity|suspicious activity',
-            r'security alert|security warning',
-            r'abnormal behavior|anomalous behavior',
-            r'activity monitoring|behavior monitoring'
-        ]
-        
-        for pattern in monitoring_patterns:
-            if re.search(pattern, content):
-                return False
+        if _SUSPICIOUS_MONITORING_RE.search(response.text):
+            return False
         
         # No monitoring detected
         return True
@@ -402,24 +377,12 @@ def has_centralized_logging(response: requests.Response) -> bool:
         True if centralized logging is detected, False otherwise
     """
     # This is difficult to detect externally, but we can look for some indicators
-    headers = {k.lower(): v for k, v in response.headers.items()}
-    content = response.text.lower()
-    
     # Look for headers or content that suggest logging infrastructure
+    # (response.headers is already case-insensitive)
     logging_headers = ['x-request-id', 'x-correlation-id', 'x-transaction-id']
     for header in logging_headers:
-        if header in headers:
+        if header in response.headers:
             return True
     
     # Look for content patterns that suggest centralized logging
-    logging_patterns = [
-        r'log aggregation|log collection',
-        r'centralized logging|unified logging',
-        r'log management|log system'
-    ]
-    
-    for pattern in logging_patterns:
-        if re.search(pattern, content):
-            return True
-    
-    return False
+    return _CENTRALIZED_LOGGING_RE.search(response.text) is not None
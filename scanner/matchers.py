@@ -0,0 +1,233 @@
+"""
+Multi-pattern matching helpers shared by the scanner modules
+"""
+import re
+import threading
+from typing import Iterable, List
+
+# pyahocorasick is optional - fall back to a single regex alternation without it
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Hyperscan is optional - both matchers fall back to the backends below without it
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# google-re2 is the second choice for RegexSet: a linear-time DFA set without SIMD
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+
+def _hyperscan_scan(database, scratch_local: threading.local, data: bytes, handler) -> None:
+    """Scan data with a block-mode Hyperscan database, using one scratch space per thread"""
+    scratch = getattr(scratch_local, 'value', None)
+    if scratch is None:
+        scratch = scratch_local.value = hyperscan.Scratch(database)
+    database.scan(data, match_event_handler=handler, scratch=scratch)
+
+
+def _hyperscan_literal(needle: str) -> bytes:
+    """Hyperscan pattern matching the UTF-8 bytes of needle literally"""
+    return ''.join(f'\\x{byte:02x}' for byte in needle.encode('utf-8', 'surrogatepass')).encode('ascii')
+
+
+class LiteralMatcher:
+    """
+    Case-insensitive (or, with ignore_case=False, exact) matcher for a fixed set of substrings.
+
+    All needles are searched in a single pass over the text: with a Hyperscan
+    database over the UTF-8 bytes when Hyperscan is installed, then with an
+    Aho-Corasick automaton when pyahocorasick is, otherwise with one compiled
+    alternation of the escaped needles.
+    """
+
+    def __init__(self, needles: Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        # Deduplicate while keeping the original order so match ids are stable
+        self.needles: List[str] = list(dict.fromkeys(
+            needle.lower() if ignore_case else needle for needle in needles if needle
+        ))
+        self._database = None
+        self._scratch = threading.local()
+        self._automaton = None
+        self._regex = None
+
+        if not self.needles:
+            return
+
+        if HAS_HYPERSCAN:
+            try:
+                # Case is folded with str.lower() before scanning, as for the
+                # automaton, since HS_FLAG_CASELESS only folds ASCII.
+                # SINGLEMATCH reports each needle once however often it occurs
+                database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+                database.compile(
+                    expressions=[_hyperscan_literal(needle) for needle in self.needles],
+                    ids=list(range(len(self.needles))),
+                    elements=len(self.needles),
+                    flags=hyperscan.HS_FLAG_SINGLEMATCH
+                )
+                self._database = database
+                return
+            except hyperscan.error:
+                self._database = None
+
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for idx, needle in enumerate(self.needles):
+                self._automaton.add_word(needle, idx)
+            self._automaton.make_automaton()
+        else:
+            self._regex = re.compile(
+                '|'.join(f'({re.escape(needle)})' for needle in self.needles),
+                re.IGNORECASE if ignore_case else 0
+            )
+
+    def _scan(self, text: str, handler) -> None:
+        data = (text.lower() if self.ignore_case else text).encode('utf-8', 'surrogatepass')
+        _hyperscan_scan(self._database, self._scratch, data, handler)
+
+    def search(self, text: str) -> bool:
+        """Return True if any needle occurs in text"""
+        if self._database is not None:
+            found = []
+
+            def on_match(needle_id, start, end, flags, context):
+                found.append(needle_id)
+                return True  # stop at the first match
+
+            try:
+                self._scan(text, on_match)
+            except hyperscan.ScanTerminated:
+                pass
+            return bool(found)
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text.lower() if self.ignore_case else text):
+                return True
+            return False
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return False
+
+    def match_ids(self, text: str) -> List[int]:
+        """Return the sorted ids (indexes into self.needles) of all needles found in text"""
+        if self._database is not None:
+            found = set()
+
+            def on_match(needle_id, start, end, flags, context):
+                found.add(needle_id)
+
+            self._scan(text, on_match)
+            return sorted(found)
+        if self._automaton is not None:
+            return sorted({idx for _, idx in self._automaton.iter(text.lower() if self.ignore_case else text)})
+        if self._regex is not None:
+            return sorted({match.lastindex - 1 for match in self._regex.finditer(text)})
+        return []
+
+
+class RegexSet:
+    """
+    Case-insensitive matcher for a fixed set of regular expressions.
+
+    With Hyperscan installed all patterns are compiled into one block-mode
+    database and scanned in a single pass; otherwise an RE2 set is used if
+    google-re2 is installed, and a single compiled re alternation as the
+    last resort. Pattern ids are the indexes into self.patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = [pattern for pattern in patterns if pattern]
+        self._database = None
+        self._scratch = threading.local()
+        self._re2_set = None
+        self._regex = None
+
+        if not self.patterns:
+            return
+
+        if HAS_HYPERSCAN:
+            try:
+                database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+                database.compile(
+                    expressions=[pattern.encode('utf-8') for pattern in self.patterns],
+                    ids=list(range(len(self.patterns))),
+                    elements=len(self.patterns),
+                    flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+                )
+                self._database = database
+                return
+            except hyperscan.error:
+                # Pattern syntax Hyperscan does not support - try the next backend
+                self._database = None
+
+        if HAS_RE2:
+            try:
+                options = re2.Options()
+                options.case_sensitive = False
+                re2_set = re2.Set.SearchSet(options)
+                for pattern in self.patterns:
+                    re2_set.Add(pattern)
+                re2_set.Compile()
+                self._re2_set = re2_set
+                return
+            except re2.error:
+                self._re2_set = None
+
+        self._regex = re.compile(
+            '|'.join(f'(?P<_{idx}>{pattern})' for idx, pattern in enumerate(self.patterns)),
+            re.IGNORECASE
+        )
+
+    def _scan(self, text: str, handler) -> None:
+        _hyperscan_scan(self._database, self._scratch, text.encode('utf-8', 'ignore'), handler)
+
+    def search(self, text: str) -> bool:
+        """Return True if any pattern matches text"""
+        if self._database is not None:
+            found = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                found.append(pattern_id)
+                return True  # stop at the first match
+
+            try:
+                self._scan(text, on_match)
+            except hyperscan.ScanTerminated:
+                pass
+            return bool(found)
+        if self._re2_set is not None:
+            return bool(self._re2_set.Match(text))
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return False
+
+    def match_ids(self, text: str) -> List[int]:
+        """
+        Return the sorted ids of the patterns that match text.
+
+        The re fallback reports the leftmost match at each position, so a
+        pattern whose only match overlaps another pattern's may be missed.
+        """
+        if self._database is not None:
+            found = set()
+
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(pattern_id)
+
+            self._scan(text, on_match)
+            return sorted(found)
+        if self._re2_set is not None:
+            return sorted(self._re2_set.Match(text) or [])
+        if self._regex is not None:
+            return sorted({int(match.lastgroup[1:]) for match in self._regex.finditer(text)})
+        return []
@@ -0,0 +1,130 @@
+"""
+Request rate limiting shared by the scanner modules
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window rate limiter.
+
+    At most requests_per_second requests are allowed in any one-second
+    window. Callers only wait once that rate is exceeded, so short bursts
+    go out immediately while sustained traffic stays polite.
+    """
+
+    def __init__(self, requests_per_second: float):
+        if requests_per_second > 0:
+            self.max_requests = max(1, int(requests_per_second))
+            self.period = self.max_requests / requests_per_second
+        else:
+            self.max_requests = 0
+            self.period = 0.0
+        # Send times of the last max_requests requests (possibly reserved in the future)
+        self._sent = deque(maxlen=self.max_requests or None)
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next free slot and return how long to wait for it"""
+        if not self.max_requests:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            if len(self._sent) < self.max_requests:
+                slot = now
+            else:
+                slot = max(now, self._sent[0] + self.period)
+            self._sent.append(slot)
+
+        return slot - now
+
+    def acquire(self) -> None:
+        """Block until the caller may send its next request"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until the caller may send its next request"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """Keeps one RateLimiter per host so each target is throttled independently"""
+
+    def __init__(self, requests_per_second: float):
+        self.requests_per_second = requests_per_second
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> RateLimiter:
+        """Return the limiter for the host of url"""
+        host = urlparse(url).netloc.lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(host, RateLimiter(self.requests_per_second))
+        return limiter
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to the host of url may be sent"""
+        self.for_url(url).acquire()
+
+    async def acquire_async(self, url: str) -> None:
+        """Wait, without blocking the event loop, until a request to the host of url may be sent"""
+        await self.for_url(url).acquire_async()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for throttling probe requests.
+
+    Up to capacity requests go out back to back; tokens then refill at rate
+    per second, so idle time builds up credit for the next burst. Callers
+    that have to wait get a small random jitter so they do not all fire at
+    the same instant.
+    """
+
+    def __init__(self, capacity: float, rate: float, jitter: float = 0.05):
+        self.capacity = capacity
+        self.rate = rate
+        self.jitter = jitter
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, n: float = 1) -> float:
+        """Take n tokens (going into debt if needed) and return how long to wait for them"""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            # Waiters queue up behind each other by the debt they leave behind
+            return -self._tokens / self.rate + random.uniform(0, self.jitter)
+
+    def acquire(self, n: float = 1) -> None:
+        """Block until n tokens are available"""
+        delay = self._reserve(n)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, n: float = 1) -> None:
+        """Wait, without blocking the event loop, until n tokens are available"""
+        delay = self._reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
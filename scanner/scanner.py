@@ -2,38 +2,55 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import time
-from typing import Set, List, Dict, Any
+from typing import Set, List, Dict, Any, Tuple
 import json
 from concurrent.futures import ThreadPoolExecutor
 import re
 from .logger import ScannerLogger
 from .config import ScannerConfig
 from .stats import ScanStats
+from .ratelimit import TokenBucket
+from .dns_cache import install_dns_cache, uninstall_dns_cache
+from .session import create_pooled_session
 from .utils import (
     normalize_url, is_valid_url, get_base_url, is_same_domain,
-    extract_links, extract_forms, generate_hash, parse_cookies,
+    extract_links, extract_forms, generate_hash, generate_url_key, parse_cookies,
     format_timestamp, save_json, get_response_time, is_error_response,
     get_error_type, extract_headers, is_vulnerable_to_xss,
     is_vulnerable_to_sql_injection
 )
 import os
 import uuid
+import functools
+import importlib
+import queue
+from collections import deque
+import threading
 
-# Import OWASP Top 10 scanner modules
-try:
-    from .broken_access import check_access_control
-    from .crypto_failures import check_cryptographic_failures
-    from .insecure_design import check_insecure_design
-    from .security_misconfiguration import check_security_misconfiguration
-    from .vulnerable_components import check_vulnerable_components
-    from .auth_failures import check_authentication_failures
-    from .integrity_failures import check_integrity_failures
-    from .logging_monitoring import check_logging_monitoring
-    from .ssrf import check_ssrf
-    HAS_OWASP_SCANNERS = True
-except ImportError:
-    HAS_OWASP_SCANNERS = False
-    print("OWASP scanner modules not available, some checks will be skipped")
+# OWASP Top 10 checkers, imported on first use so scans that disable a check
+# never load its module: name -> (module, checker function)
+OWASP_CHECKERS = {
+    'broken_access': ('.broken_access', 'check_access_control'),
+    'crypto_failures': ('.crypto_failures', 'check_cryptographic_failures'),
+    'insecure_design': ('.insecure_design', 'check_insecure_design'),
+    'security_misconfiguration': ('.security_misconfiguration', 'check_security_misconfiguration'),
+    'vulnerable_components': ('.vulnerable_components', 'check_vulnerable_components'),
+    'auth_failures': ('.auth_failures', 'check_authentication_failures'),
+    'integrity_failures': ('.integrity_failures', 'check_integrity_failures'),
+    'logging_monitoring': ('.logging_monitoring', 'check_logging_monitoring'),
+    'ssrf': ('.ssrf', 'check_ssrf'),
+}
+
+@functools.lru_cache(maxsize=None)
+def _get_checker(name: str):
+    """Import an OWASP checker on first use, returning None if its module is unavailable"""
+    module_name, func_name = OWASP_CHECKERS[name]
+    try:
+        module = importlib.import_module(module_name, __package__)
+    except ImportError:
+        print(f"OWASP scanner module {module_name.lstrip('.')} not available, its checks will be skipped")
+        return None
+    return getattr(module, func_name)
 
 # Import Firebase module
 try:
@@ -59,8 +76,17 @@ class Scanner:
         self.stats = ScanStats()
         self.visited_urls: Set[str] = set()
         self.vulnerabilities: List[Dict[str, Any]] = []
-        self.scanned_links: List[Dict[str, Any]] = []
-        self.scanned_forms: List[Dict[str, Any]] = []
+        self._reset_scanned_columns()
+        
+        # (base_url, endpoint) pairs already probed for SSRF, so each host's API is probed once
+        self._probed_apis: Set[Tuple[str, str]] = set()
+        
+        # aiohttp client for the SSRF probes, created on first use and closed when the scan ends
+        self._ssrf_probe_client = None
+        
+        # Last formatted timestamp, reused while the wall-clock second is unchanged
+        self._ts_last_sec = -1
+        self._ts_last_str = ''
         
         # Configure OWASP scan options with defaults
         if 'scan_broken_access' not in self.config.get_all():
@@ -85,6 +111,9 @@ class Scanner:
         # Initialize Firebase
         self.firebase = None
         self.scan_id = None
+        self._fb_queue = None
+        self._fb_writer = None
+        self._fb_streamed = False
         if HAS_FIREBASE:
             try:
                 self.firebase = ScannerFirebase()
@@ -93,8 +122,12 @@ class Scanner:
             except Exception as e:
                 self.logger.error(f"Failed to initialize Firebase: {str(e)}")
         
-        # Configure session
-        self.session = requests.Session()
+        # One token bucket throttles the vulnerability probes of the whole scan
+        self.probe_limiter = TokenBucket(self.config.get('probe_burst', 5), self.config.get('probe_rate', 2.0))
+        
+        # Configure session - pooled so the probe fan-out reuses its connections,
+        # without adapter retries because _make_request already retries
+        self.session = create_pooled_session(retries=0)
         self.session.headers.update({
             'User-Agent': self.config.get('user_agent')
         })
@@ -105,9 +138,68 @@ class Scanner:
                 'https': self.config.get('proxy_url')
             }
     
+    def _reset_scanned_columns(self):
+        """Reset the column lists holding scanned links and forms"""
+        # Links and forms are stored as parallel columns with epoch timestamps
+        # and only zipped into records when the results are serialized
+        self.links_source: List[str] = []
+        self.links_target: List[str] = []
+        self.links_ts: List[int] = []
+        self.forms_url: List[str] = []
+        self.forms_action: List[str] = []
+        self.forms_method: List[str] = []
+        self.forms_inputs: List[List[Dict[str, Any]]] = []
+        self.forms_ts: List[int] = []
+    
+    def _ts_cached(self) -> str:
+        """Get the current timestamp string, formatting it at most once per second"""
+        now = int(time.time())
+        if now != self._ts_last_sec:
+            self._ts_last_sec = now
+            self._ts_last_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        return self._ts_last_str
+    
+    @staticmethod
+    def _format_epochs(timestamps: List[int]) -> List[str]:
+        """Format epoch seconds, formatting each distinct second only once"""
+        formatted: Dict[int, str] = {}
+        result = []
+        for ts in timestamps:
+            text = formatted.get(ts)
+            if text is None:
+                text = formatted[ts] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))
+            result.append(text)
+        return result
+    
+    @property
+    def scanned_links(self) -> List[Dict[str, Any]]:
+        """Scanned links as a list of records"""
+        return [
+            {'source_url': source, 'target_url': target, 'timestamp': ts}
+            for source, target, ts in zip(self.links_source, self.links_target,
+                                          self._format_epochs(self.links_ts))
+        ]
+    
+    @property
+    def scanned_forms(self) -> List[Dict[str, Any]]:
+        """Scanned forms as a list of records"""
+        return [
+            {'url': url, 'action': action, 'method': method, 'inputs': inputs, 'timestamp': ts}
+            for url, action, method, inputs, ts in zip(self.forms_url, self.forms_action,
+                                                       self.forms_method, self.forms_inputs,
+                                                       self._format_epochs(self.forms_ts))
+        ]
+    
+    def _get_enabled_checker(self, config_key: str, name: str):
+        """Get an OWASP checker if its scan option is enabled, otherwise None"""
+        if not self.config.get(config_key, True):
+            return None
+        return _get_checker(name)
+    
     def _check_broken_access_control(self, start_url: str):
         """Check for broken access control vulnerabilities (A01)"""
-        if not HAS_OWASP_SCANNERS or not self.config.get('scan_broken_access', True):
+        check_access_control = self._get_enabled_checker('scan_broken_access', 'broken_access')
+        if check_access_control is None:
             return
             
         self.logger.info("Starting broken access control scan")
@@ -123,36 +215,126 @@ class Scanner:
         self.logger.scan_start(start_url)
         self.stats = ScanStats()  # Reset stats
         self.vulnerabilities = []  # Reset vulnerabilities
-        self.scanned_links = []    # Reset scanned links
-        self.scanned_forms = []    # Reset scanned forms
+        self._reset_scanned_columns()  # Reset scanned links and forms
+        self._probed_apis = set()  # API endpoints already probed for SSRF
         
         # Set scan ID for Firebase or generate one if none provided
         self.scan_id = scan_id if scan_id else str(uuid.uuid4())
         
+        # Stream vulnerabilities to Firebase while the scan runs
+        self._start_firebase_writer()
+        
         try:
+            # Probes hit the same few hosts over and over - resolve each one once,
+            # for this scan only since the cache patches the whole process
+            install_dns_cache(self.config.get('dns_cache_ttl', 900))
+            
+            # Local saves stream scanned URLs and vulnerabilities to disk as they are
+            # found; if the files cannot be opened they stay in memory instead
+            if not self._saves_to_firebase():
+                output_dir = self.config.get('output_dir')
+                if output_dir and not self.stats.open_streams(output_dir):
+                    self.logger.error(f"Cannot write to {output_dir}, keeping scan results in memory")
+            
             # Check for broken access control vulnerabilities first
             self._check_broken_access_control(start_url)
             
             # Proceed with regular scanning
-            self._scan_url(start_url, depth=0)
+            self._crawl(start_url)
+            self._close_ssrf_probe_client()
             self.stats.complete()
+            self.stats.close()
+            self._stop_firebase_writer()
             self._save_results()
             self.logger.scan_complete(self.stats.get_summary())
             return self.scan_id
         except Exception as e:
+            self._close_ssrf_probe_client()
+            self.stats.close()
+            self._stop_firebase_writer()
             self.logger.error(f"Scan failed: {str(e)}")
             raise
+        finally:
+            uninstall_dns_cache()
     
-    def _scan_url(self, url: str, depth: int):
-        """Scan a single URL"""
-        if depth > self.config.get('max_depth'):
+    def _get_ssrf_probe_client(self):
+        """Get the scan's SSRF probe client, creating it on first use (None if probes stay on requests)"""
+        if self._ssrf_probe_client is None:
+            from .ssrf import create_probe_client
+            self._ssrf_probe_client = create_probe_client(self.session)
+        return self._ssrf_probe_client
+    
+    def _close_ssrf_probe_client(self):
+        """Close the SSRF probe client's connections and event loop"""
+        if self._ssrf_probe_client is not None:
+            self._ssrf_probe_client.close()
+            self._ssrf_probe_client = None
+    
+    def _saves_to_firebase(self) -> bool:
+        """Check whether results go to Firebase rather than local files"""
+        return bool(HAS_FIREBASE and self.firebase and self.firebase.is_initialized())
+    
+    def _start_firebase_writer(self):
+        """Start the background thread that streams vulnerabilities to Firebase"""
+        self._fb_streamed = False
+        if not self._saves_to_firebase():
+            return
+        
+        self._fb_queue = queue.Queue()
+        self._fb_writer = threading.Thread(target=self._firebase_writer, args=(self._fb_queue,), daemon=True)
+        self._fb_writer.start()
+    
+    def _firebase_writer(self, vuln_queue: queue.Queue):
+        """Drain queued vulnerabilities into Firebase batches until the stop marker"""
+        while True:
+            vuln = vuln_queue.get()
+            if vuln is None:
+                break
+            self.firebase.queue_vulnerability(self.scan_id, vuln, self.logger)
+    
+    def _stop_firebase_writer(self):
+        """Stop the writer thread and commit the final partial batch"""
+        if self._fb_writer is None:
             return
         
+        self._fb_queue.put(None)
+        self._fb_writer.join()
+        self.firebase.flush_vulnerabilities(self.logger)
+        self._fb_streamed = not self.firebase.batch_failed
+        self._fb_queue = None
+        self._fb_writer = None
+    
+    def _crawl(self, start_url: str):
+        """Crawl breadth-first from start_url using an explicit frontier queue"""
+        start_url = normalize_url(start_url)
+        max_depth = self.config.get('max_depth')
+        frontier = deque([(start_url, 0)])
+        # URLs are checked here before being enqueued so the frontier never holds
+        # duplicates; integer hash keys keep this set small on large crawls
+        queued = {generate_url_key(start_url)}
+        
+        while frontier and len(self.visited_urls) < self.config.get('max_pages'):
+            url, depth = frontier.popleft()
+            for link in self._scan_url(url, depth):
+                if depth + 1 > max_depth:
+                    continue
+                link_key = generate_url_key(link)
+                if link_key not in queued:
+                    queued.add(link_key)
+                    frontier.append((link, depth + 1))
+    
+    def _scan_url(self, url: str, depth: int) -> List[str]:
+        """Scan a single URL and return the same-domain links to crawl next"""
+        next_links: List[str] = []
+        
+        if depth > self.config.get('max_depth'):
+            return next_links
+        
         if len(self.visited_urls) >= self.config.get('max_pages'):
-            return        
+            return next_links
         url = normalize_url(url)
         if url in self.visited_urls:
-            return
+            return next_links
         
         self.visited_urls.add(url)
         self.stats.add_url(url)
@@ -161,7 +343,7 @@ class Scanner:
         try:
             response = self._make_request(url)
             if response is None:
-                return
+                return next_links
             
             # Update stats
             response_time = get_response_time(response)
@@ -171,7 +353,7 @@ class Scanner:
                 error_type = get_error_type(response)
                 self.stats.add_error(error_type)
                 self.logger.error(f"Error {response.status_code} for {url}")
-                return
+                return next_links
             
             # Scan for URL parameter XSS vulnerabilities
             if self.config.get('scan_xss', True):
@@ -180,86 +362,102 @@ class Scanner:
             # Extract and scan forms
             if self.config.get('scan_forms'):
                 forms = extract_forms(response.text, url)
+                found_at = int(time.time())
                 for form in forms:
-                    form_data = {
-                        'url': url,
-                        'action': form['action'],
-                        'method': form['method'],
-                        'inputs': form['inputs'],
-                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    self.scanned_forms.append(form_data)
+                    self.forms_url.append(url)
+                    self.forms_action.append(form['action'])
+                    self.forms_method.append(form['method'])
+                    self.forms_inputs.append(form['inputs'])
+                    self.forms_ts.append(found_at)
                     self.logger.form_found(form)
-                    self._scan_form(form, url)
+                    self._scan_form(form, url, response)
             
             # Extract and scan links
             if self.config.get('scan_links'):
                 links = extract_links(response.text, url)
+                found_at = int(time.time())
                 for link in links:
-                    link_data = {
-                        'source_url': url,
-                        'target_url': link,
-                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')                    }
-                    self.scanned_links.append(link_data)
+                    self.links_source.append(url)
+                    self.links_target.append(link)
+                    self.links_ts.append(found_at)
                     self.logger.link_found(link)
                     if is_same_domain(link, url):
-                        self._scan_url(link, depth + 1)            # Check security headers
+                        next_links.append(link)            # Check security headers
             if self.config.get('scan_headers'):
                 headers_result = extract_headers(response)
                 missing_headers = headers_result['missing']
                 
                 if missing_headers:
-                    # Report each missing header as a separate vulnerability
-                    for header, info in missing_headers.items():
-                        vuln_type = f"missing_{header.lower().replace('-', '_')}"
-                        self._add_vulnerability(vuln_type, url, {
-                            'description': f"Missing {header}: {info['description']}",
-                            'recommendation': f"Implement the {header} header to improve security",
-                            'severity': 'Medium',
-                            'header_name': header,
-                            'header_description': info['description'],
-                            'consequences': info['consequences']
-                        })
+                    # Report each missing header as a separate vulnerability,
+                    # sharing one timestamp and file name for the whole URL
+                    timestamp = self._ts_cached()
+                    file_name = self._get_file_from_url(url)
+                    self._add_vulnerabilities([
+                        {
+                            'type': f"missing_{header.lower().replace('-', '_')}",
+                            'url': url,
+                            'timestamp': timestamp,
+                            'details': {
+                                'description': f"Missing {header}: {info['description']}",
+                                'recommendation': f"Implement the {header} header to improve security",
+                                'severity': 'Medium',
+                                'header_name': header,
+                                'header_description': info['description'],
+                                'consequences': info['consequences']
+                            },
+                            'file': file_name
+                        }
+                        for header, info in missing_headers.items()
+                    ])
             
             # Check for cryptographic failures (A02)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_crypto_failures', True):
+            check_cryptographic_failures = self._get_enabled_checker('scan_crypto_failures', 'crypto_failures')
+            if check_cryptographic_failures:
                 crypto_vulns = check_cryptographic_failures(url, response, self.logger.info)
                 for vuln in crypto_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for security misconfigurations (A05)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_security_misconfigurations', True):
+            check_security_misconfiguration = self._get_enabled_checker('scan_security_misconfigurations', 'security_misconfiguration')
+            if check_security_misconfiguration:
                 misconfig_vulns = check_security_misconfiguration(url, response, self.logger.info)
                 for vuln in misconfig_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for vulnerable components (A06)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_vulnerable_components', True):
+            check_vulnerable_components = self._get_enabled_checker('scan_vulnerable_components', 'vulnerable_components')
+            if check_vulnerable_components:
                 component_vulns = check_vulnerable_components(url, response, self.logger.info)
                 for vuln in component_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for authentication failures (A07)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_auth_failures', True):
+            check_authentication_failures = self._get_enabled_checker('scan_auth_failures', 'auth_failures')
+            if check_authentication_failures:
                 auth_vulns = check_authentication_failures(url, response, self.logger.info)
                 for vuln in auth_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for software and data integrity failures (A08)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_integrity_failures', True):
+            check_integrity_failures = self._get_enabled_checker('scan_integrity_failures', 'integrity_failures')
+            if check_integrity_failures:
                 integrity_vulns = check_integrity_failures(url, response, self.logger.info)
                 for vuln in integrity_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for security logging and monitoring failures (A09)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_logging_monitoring', True):
+            check_logging_monitoring = self._get_enabled_checker('scan_logging_monitoring', 'logging_monitoring')
+            if check_logging_monitoring:
                 logging_vulns = check_logging_monitoring(url, response, self.session, self.logger.info)
                 for vuln in logging_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
             # Check for SSRF vulnerabilities (A10)
-            if HAS_OWASP_SCANNERS and self.config.get('scan_ssrf', True):
-                ssrf_vulns = check_ssrf(url, response, self.session, self.logger.info)
+            check_ssrf = self._get_enabled_checker('scan_ssrf', 'ssrf')
+            if check_ssrf:
+                ssrf_vulns = check_ssrf(url, response, self.session, self.logger.info,
+                                        limiter=self.probe_limiter, probed_apis=self._probed_apis,
+                                        probe_client=self._get_ssrf_probe_client())
                 for vuln in ssrf_vulns:
                     self._add_vulnerability(vuln['type'], url, vuln['details'])
             
@@ -270,19 +468,32 @@ class Scanner:
         except Exception as e:
             self.logger.error(f"Error scanning {url}: {str(e)}")
             self.stats.add_error('request_error')
+        
+        return next_links
     
     def _add_vulnerability(self, vuln_type: str, url: str, details: Dict[str, Any]):
         """Add a vulnerability to the list"""
         vuln_data = {
             'type': vuln_type,
             'url': url,
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': self._ts_cached(),
             'details': details,
             'file': self._get_file_from_url(url)
         }
         self.vulnerabilities.append(vuln_data)
         self.stats.add_vulnerability(vuln_type, url, vuln_data)
         self.logger.vulnerability_found(vuln_data)
+        if self._fb_queue is not None:
+            self._fb_queue.put(vuln_data)
+    
+    def _add_vulnerabilities(self, vulns: List[Dict[str, Any]]):
+        """Add several already-built vulnerability records at once"""
+        self.vulnerabilities.extend(vulns)
+        self.stats.add_vulnerabilities_bulk(vulns)
+        for vuln_data in vulns:
+            self.logger.vulnerability_found(vuln_data)
+            if self._fb_queue is not None:
+                self._fb_queue.put(vuln_data)
     
     def _get_file_from_url(self, url: str) -> str:
         """Extract file name from URL"""
@@ -292,8 +503,8 @@ class Scanner:
             return 'index.html'
         return os.path.basename(path) or 'index.html'
     
-    def _scan_form(self, form: Dict[str, Any], url: str):
-        """Scan a form for vulnerabilities"""
+    def _scan_form(self, form: Dict[str, Any], url: str, response: requests.Response):
+        """Scan a form for vulnerabilities, reusing the response of the page containing it"""
         if not form['inputs']:
             return
         
@@ -306,11 +517,11 @@ class Scanner:
             
             try:
                 if form['method'] == 'get':
-                    response = self.session.get(form['action'], params=data)
+                    test_response = self.session.get(form['action'], params=data)
                 else:
-                    response = self.session.post(form['action'], data=data)
+                    test_response = self.session.post(form['action'], data=data)
                 
-                if is_vulnerable_to_sql_injection(response, payload):                    self._add_vulnerability('sql_injection', url, {
+                if is_vulnerable_to_sql_injection(test_response, payload):                    self._add_vulnerability('sql_injection', url, {
                         'form': form,
                         'payload': payload,
                         'method': form['method'],
@@ -325,15 +536,21 @@ class Scanner:
                 self.logger.error(f"Error testing SQL injection: {str(e)}")
         
         # Check for insecure design (A04)
-        if HAS_OWASP_SCANNERS and self.config.get('scan_insecure_design', True):
+        check_insecure_design = self._get_enabled_checker('scan_insecure_design', 'insecure_design')
+        if check_insecure_design:
             try:
-                # Get the response with the form
+                # Reuse the page response when the form posts back to the same URL,
+                # only fetch the action URL when it points somewhere else
                 form_url = form['action'] if form['action'].startswith('http') else urljoin(url, form['action'])
-                form_response = self.session.get(form_url, timeout=self.config.get('request_timeout'))
+                if normalize_url(form_url) == url:
+                    form_response = response
+                else:
+                    form_response = self._make_request(form_url)
                 
-                insecure_design_vulns = check_insecure_design(url, form, form_response, self.session, self.logger.info)
-                for vuln in insecure_design_vulns:
-                    self._add_vulnerability(vuln['type'], url, vuln['details'])
+                if form_response is not None:
+                    insecure_design_vulns = check_insecure_design(url, form, form_response, self.session, self.logger.info)
+                    for vuln in insecure_design_vulns:
+                        self._add_vulnerability(vuln['type'], url, vuln['details'])
             except Exception as e:
                 self.logger.error(f"Error checking insecure design: {str(e)}")
           
@@ -353,14 +570,14 @@ class Scanner:
             
             try:
                 if form['method'] == 'get':
-                    response = self.session.get(form['action'], params=data)
+                    test_response = self.session.get(form['action'], params=data)
                 else:
-                    response = self.session.post(form['action'], data=data)
+                    test_response = self.session.post(form['action'], data=data)
                 
-                if is_vulnerable_to_xss(response, payload):
+                if is_vulnerable_to_xss(test_response, payload):
                     # Use enhanced XSS details if available
                     try:
-                        xss_details = get_xss_details(response, payload, input_field['name'])
+                        xss_details = get_xss_details(test_response, payload, input_field['name'])
                         details = {
                             'form': form,
                             'payload': payload,
@@ -404,7 +621,7 @@ class Scanner:
             from .xss_scanner import scan_url_parameters, analyze_xss_vulnerability
             
             # Scan URL parameters
-            vulnerabilities = scan_url_parameters(url, self.session)
+            vulnerabilities = scan_url_parameters(url, self.session, limiter=self.probe_limiter)
             
             # Process detected vulnerabilities
             for vuln in vulnerabilities:
@@ -438,8 +655,11 @@ class Scanner:
     def _save_results(self):
         """Save scan results"""
         # First save results to Firebase if available
-        if HAS_FIREBASE and self.firebase and self.firebase.is_initialized():
+        if self._saves_to_firebase():
             results = self.get_results()
+            if self._fb_streamed:
+                # Vulnerabilities were already written in batches during the scan
+                del results['vulnerabilities']
             try:
                 firebase_result = self.firebase.save_scan_results(self.scan_id, results, self.logger)
                 if firebase_result and firebase_result.get('success'):
@@ -482,11 +702,12 @@ class Scanner:
         config_file = os.path.join(output_dir, 'scan_config.json')
         save_json(self.config.get_all(), config_file)
         
-        # Save a list of all scanned URLs
-        urls_file = os.path.join(output_dir, 'scanned_urls.txt')
-        with open(urls_file, 'w') as f:
-            for url in self.visited_urls:
-                f.write(f"{url}\n")
+        # Unless ScanStats streamed it during the scan, write the list of scanned URLs
+        if not self.stats.streamed:
+            urls_file = os.path.join(output_dir, 'scanned_urls.txt')
+            with open(urls_file, 'w') as f:
+                for url in self.stats.scanned_urls:
+                    f.write(f"{url}\n")
         
         # Save detailed results
         detailed_results = self.get_results()
@@ -504,8 +725,8 @@ class Scanner:
                 'duration': self.stats.get_duration(),
                 'total_urls_scanned': self.stats.total_urls_scanned,
                 'total_vulnerabilities': len(self.vulnerabilities),
-                'total_links_scanned': len(self.scanned_links),
-                'total_forms_scanned': len(self.scanned_forms),
+                'total_links_scanned': len(self.links_target),
+                'total_forms_scanned': len(self.forms_action),
                 'scan_id': self.scan_id
             },
             'vulnerabilities_by_type': self.stats.vulnerabilities_by_type,
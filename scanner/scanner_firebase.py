@@ -14,11 +14,20 @@ from firebase.firebase_service import FirebaseService
 class ScannerFirebase:
     """Handles Firebase operations for the scanner"""
     
+    # Number of queued vulnerabilities written per multi-path update
+    BATCH_SIZE = 450
+    
     def __init__(self):
         """Initialize Firebase service"""
         self.firebase = None
         self.initialized = False
         
+        # Vulnerabilities waiting for the next batched write
+        self._batch = []
+        self._batch_scan_id = None
+        self._batch_next_index = 0
+        self.batch_failed = False
+        
         try:
             self.firebase = FirebaseService.get_instance()
             self.firebase.initialize()
@@ -64,6 +73,45 @@ class ScannerFirebase:
                 'message': error_msg
             }
     
+    def queue_vulnerability(self, scan_id, vuln, logger=None):
+        """Queue a vulnerability and write the batch once it is full"""
+        if scan_id != self._batch_scan_id:
+            # New scan - flush anything left from the previous one and restart indexing
+            self.flush_vulnerabilities(logger)
+            self._batch_scan_id = scan_id
+            self._batch_next_index = 0
+            self.batch_failed = False
+        
+        self._batch.append(vuln)
+        if len(self._batch) >= self.BATCH_SIZE:
+            self.flush_vulnerabilities(logger)
+    
+    def flush_vulnerabilities(self, logger=None):
+        """Write all queued vulnerabilities in a single update"""
+        if not self._batch:
+            return
+        
+        batch = self._batch
+        self._batch = []
+        
+        if not self.initialized or not self.firebase:
+            self.batch_failed = True
+            return
+        
+        try:
+            result = self.firebase.save_vulnerabilities_batch(self._batch_scan_id, self._batch_next_index, batch)
+        except Exception as e:
+            result = {
+                'success': False,
+                'message': f"Error saving vulnerabilities to Firebase: {str(e)}"
+            }
+        
+        self._batch_next_index += len(batch)
+        if not result.get('success'):
+            self.batch_failed = True
+            if logger:
+                logger.error(f"Failed to stream vulnerabilities to Firebase: {result.get('message')}")
+    
     def get_scan_results(self, scan_id, logger=None):
         """Get scan results from Firebase"""
         if not self.initialized or not self.firebase:
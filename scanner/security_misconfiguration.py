@@ -1,10 +1,12 @@
 """
 A05 - Security Misconfiguration Scanner Module
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 import requests
 import re
 
+from .matchers import LiteralMatcher, RegexSet
+
 # Security headers that should be present
 SECURITY_HEADERS = {
     'Content-Security-Policy': {
@@ -45,6 +47,103 @@ SECURITY_HEADERS = {
     }
 }
 
+_SECURITY_HEADERS_ITEMS = tuple(SECURITY_HEADERS.items())
+
+# Patterns that suggest directory listing is enabled
+DIRECTORY_LISTING_PATTERNS = [
+    r'<title>index of',
+    r'<h1>directory listing',
+    r'<h1>index of',
+    r'parent directory</a>',
+    r'directory listing for',
+    r'<pre>name\s+last modified\s+size\s+description',
+    r'<pre>directory listing of'
+]
+
+# Patterns that suggest verbose error messages or stack traces
+VERBOSE_ERROR_PATTERNS = [
+    r'exception|stack trace|syntax error|fatal error',
+    r'(sql|odbc|ole db|jdbc) error',
+    r'(php|python|ruby|perl|java|\.net) error',
+    r'line \d+ of file',
+    r'call stack',
+    r'uncaught exception',
+    r'debug info',
+    r'thrown in',
+    r'undefined index:',
+    r'undefined variable:',
+    r'error occurred in',
+    r'<b>warning</b>:',
+    r'<b>notice</b>:',
+    r'<b>error</b>:'
+]
+
+# URL fragments of default config files or pages
+DEFAULT_CONFIG_INDICATORS = (
+    'phpinfo.php',
+    'config.php',
+    'config.inc.php',
+    'setup.php',
+    'default.config',
+    'conf.default',
+    'wp-config.php',
+    'server-status',
+    'server-info',
+    '.env',
+    '.git',
+    '.svn',
+    '.htpasswd',
+    '.htaccess',
+    'config.xml',
+    'web.config',
+    'settings.py',
+    'settings.ini'
+)
+
+# Response content that suggests a default installation or exposed configuration
+DEFAULT_CONTENT_INDICATORS = (
+    'installation complete',
+    'setup successful',
+    'default password',
+    'default username',
+    'default admin',
+    'password is',
+    'username is',
+    'configuration file',
+    'config file'
+)
+
+# All body patterns share one matcher so a response is scanned once; each
+# pattern id maps back to the category it belongs to
+_BODY_PATTERN_CATEGORIES = (
+    [('directory_listing', p) for p in DIRECTORY_LISTING_PATTERNS] +
+    [('verbose_errors', p) for p in VERBOSE_ERROR_PATTERNS] +
+    [('default_content', re.escape(p)) for p in DEFAULT_CONTENT_INDICATORS]
+)
+_BODY_MATCHER = RegexSet(p for _, p in _BODY_PATTERN_CATEGORIES)
+
+# The URL indicators are plain substrings, matched in a single Aho-Corasick pass
+_DEFAULT_CONFIG_MATCHER = LiteralMatcher(DEFAULT_CONFIG_INDICATORS)
+
+# Error and listing signatures appear near the top of a page, so only the
+# head of a large body is scanned, and only for text-like content types
+MAX_SCAN_CHARS = 64 * 1024
+_TEXT_CONTENT_TYPES = ('html', 'text', 'json', 'xml')
+
+def _scannable_text(response: requests.Response) -> str:
+    """Return the part of the body worth pattern-scanning, or '' for binary content"""
+    content_type = response.headers.get('Content-Type', '').lower()
+    if content_type and not any(t in content_type for t in _TEXT_CONTENT_TYPES):
+        return ''
+    return response.text[:MAX_SCAN_CHARS]
+
+def _body_categories(response: requests.Response) -> Set[str]:
+    """Return the pattern categories found in a response body"""
+    text = _scannable_text(response)
+    if not text:
+        return set()
+    return {_BODY_PATTERN_CATEGORIES[idx][0] for idx in _BODY_MATCHER.match_ids(text)}
+
 def check_security_misconfiguration(url: str, response: requests.Response, log_func=None) -> List[Dict[str, Any]]:
     """
     Check for security misconfigurations
@@ -62,6 +161,9 @@ def check_security_misconfiguration(url: str, response: requests.Response, log_f
     if log_func:
         log_func(f"Checking security misconfigurations for {url}")
     
+    # Scan the body once for every pattern category
+    categories = _body_categories(response)
+    
     # Check for missing security headers
     missing_headers = check_missing_headers(response)
     for header, details in missing_headers.items():
@@ -82,7 +184,7 @@ def check_security_misconfiguration(url: str, response: requests.Response, log_f
             log_func(f"Found missing security header: {header} at {url}")
     
     # Check for directory listing
-    if has_directory_listing(response):
+    if has_directory_listing(response, categories):
         vuln_data = {
             'type': 'security_misconfiguration_directory_listing',
             'url': url,
@@ -99,7 +201,7 @@ def check_security_misconfiguration(url: str, response: requests.Response, log_f
             log_func(f"Found directory listing at {url}")
     
     # Check for verbose error messages or stack traces
-    if has_verbose_errors(response):
+    if has_verbose_errors(response, categories):
         vuln_data = {
             'type': 'security_misconfiguration_verbose_errors',
             'url': url,
@@ -116,7 +218,7 @@ def check_security_misconfiguration(url: str, response: requests.Response, log_f
             log_func(f"Found verbose error messages at {url}")
     
     # Check for default credentials or configuration files
-    if has_default_configs(url, response):
+    if has_default_configs(url, response, categories):
         vuln_data = {
             'type': 'security_misconfiguration_default_configs',
             'url': url,
@@ -144,139 +246,64 @@ def check_missing_headers(response: requests.Response) -> Dict[str, Dict[str, st
     Returns:
         Dictionary of missing headers with details
     """
-    missing = {}
-    headers = {k.lower(): v for k, v in response.headers.items()}
-    
-    for header, details in SECURITY_HEADERS.items():
-        header_lower = header.lower()
-        if header_lower not in headers:
-            missing[header] = details
-    
-    return missing
+    # response.headers is a case-insensitive dict, so no lowercased copy is needed
+    return {header: details for header, details in _SECURITY_HEADERS_ITEMS if header not in response.headers}
 
-def has_directory_listing(response: requests.Response) -> bool:
+def has_directory_listing(response: requests.Response, categories: Optional[Set[str]] = None) -> bool:
     """
     Check if directory listing is enabled
     
     Args:
         response: The HTTP response
+        categories: Body pattern categories already computed for this response
     
     Returns:
         True if directory listing is enabled, False otherwise
     """
     # Check for common directory listing signatures
     if response.status_code == 200:
-        content = response.text.lower()
-        
-        # Look for patterns that suggest directory listing
-        patterns = [
-            r'<title>index of',
-            r'<h1>directory listing',
-            r'<h1>index of',
-            r'parent directory</a>',
-            r'directory listing for',
-            r'<pre>name\s+last modified\s+size\s+description',
-            r'<pre>directory listing of'
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, content):
-                return True
+        if categories is None:
+            categories = _body_categories(response)
+        return 'directory_listing' in categories
     
     return False
 
-def has_verbose_errors(response: requests.Response) -> bool:
+def has_verbose_errors(response: requests.Response, categories: Optional[Set[str]] = None) -> bool:
     """
     Check for verbose error messages or stack traces
     
     Args:
         response: The HTTP response
+        categories: Body pattern categories already computed for this response
     
     Returns:
         True if verbose errors are detected, False otherwise
     """
     # Check for common error patterns
     if response.status_code >= 400:
-        content = response.text.lower()
-        
-        # Look for patterns that suggest verbose errors
-        patterns = [
-            r'exception|stack trace|syntax error|fatal error',
-            r'(sql|odbc|ole db|jdbc) error',
-            r'(php|python|ruby|perl|java|\.net) error',
-            r'line \d+ of file',
-            r'call stack',
-            r'uncaught exception',
-            r'debug info',
-            r'thrown in',
-            r'undefined index:',
-            r'undefined variable:',
-            r'error occurred in',
-            r'<b>warning</b>:',
-            r'<b>notice</b>:',
-            r'<b>error</b>:'
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, content):
-                return True
+        if categories is None:
+            categories = _body_categories(response)
+        return 'verbose_errors' in categories
     
     return False
 
-def has_default_configs(url: str, response: requests.Response) -> bool:
+def has_default_configs(url: str, response: requests.Response, categories: Optional[Set[str]] = None) -> bool:
     """
     Check for default configuration files
     
     Args:
         url: The URL to check
         response: The HTTP response
+        categories: Body pattern categories already computed for this response
     
     Returns:
         True if default configurations are detected, False otherwise
     """
-    # List of default config files or indicators
-    default_config_indicators = [
-        'phpinfo.php',
-        'config.php',
-        'config.inc.php',
-        'setup.php',
-        'default.config',
-        'conf.default',
-        'wp-config.php',
-        'server-status',
-        'server-info',
-        '.env',
-        '.git',
-        '.svn',
-        '.htpasswd',
-        '.htaccess',
-        'config.xml',
-        'web.config',
-        'settings.py',
-        'settings.ini'
-    ]
-    
     # Check if the URL contains any default config indicators
-    for indicator in default_config_indicators:
-        if indicator in url.lower():
-            return True
+    if _DEFAULT_CONFIG_MATCHER.search(url):
+        return True
     
     # Check if the response contains default configuration information
-    content = response.text.lower()
-    default_content_indicators = [
-        'installation complete',
-        'setup successful',
-        'default password',
-        'default username',
-        'default admin',
-        'password is',
-        'username is',
-        'configuration file',
-        'config file'
-    ]
-    
-    for indicator in default_content_indicators:
-        if indicator in content:
-            return True
-    
-    return False
+    if categories is None:
+        categories = _body_categories(response)
+    return 'default_content' in categories
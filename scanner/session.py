@@ -1,10 +1,29 @@
 # crawler/session.py
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept open per host, sized for concurrent payload requests
+POOL_SIZE = 64
+
+def create_pooled_session(pool_size: int = POOL_SIZE, retries: int = 2) -> requests.Session:
+    """Create a keep-alive requests.Session with a large connection pool and light retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # A read timeout is not retried, so a server that never answers costs one timeout, not three
+        max_retries=Retry(total=retries, read=0, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
 
 class CustomSession:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_pooled_session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (WebScannerBot)"
         })
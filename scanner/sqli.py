@@ -1,17 +1,107 @@
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, parse_qs, urlparse
-import time
+from urllib.parse import urljoin, parse_qs, parse_qsl, urlparse, urlencode, urlunparse, quote_plus
+import asyncio
 import json
-from typing import List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Union
+
+# httpx (with h2) is optional - payloads are sent over the pooled requests session without it
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+# lxml is a much faster (C) parser for BeautifulSoup; html.parser is the stdlib fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+from .matchers import LiteralMatcher, RegexSet
+from .ratelimit import HostRateLimiter
+from .utils import SESSION
+
+# SQL error messages that indicate an injectable parameter
+ERROR_PATTERNS = [
+    "SQL syntax",
+    "mysql_fetch_array",
+    "mysql_fetch",
+    "mysql_num_rows",
+    "mysql_result",
+    "mysql_query",
+    "mysql error",
+    "ORA-",
+    "SQLite/JDBCDriver",
+    "SQLite.Exception",
+    "System.Data.SQLite.SQLiteException",
+    "Warning: mysql_",
+    "valid PostgreSQL result",
+    "Npgsql.",
+    "Microsoft SQL Server",
+    "ODBC SQL Server Driver",
+    "SQLServer JDBC Driver",
+    "com.microsoft.sqlserver.jdbc.SQLServerException",
+    "SQLServerException",
+    "Error Occurred While Processing Request",
+    "Server Error in '/' Application",
+    "Unclosed quotation mark after the character string",
+    "Microsoft OLE DB Provider for SQL Server",
+    "System.Data.SqlClient.SqlException"
+]
+
+# SQL error messages that need a regular expression to match
+ERROR_REGEXES = [
+    "PostgreSQL.*ERROR",
+    "Warning.*pg_"
+]
+
+# Fixed strings go through one Aho-Corasick pass, the few real regexes through
+# a multi-pattern matcher (Hyperscan when available); both compiled once
+_SQL_ERROR_LITERALS = LiteralMatcher(ERROR_PATTERNS)
+_SQL_ERROR_REGEXES = RegexSet(ERROR_REGEXES)
+
+# Payload responses are scanned chunk by chunk; the overlap carries the end of
+# the previous chunk over so signatures split across a boundary still match
+STREAM_CHUNK_SIZE = 8192
+STREAM_OVERLAP = 256
+
+# Seconds SQLiScanner waits for a server before giving up on a request (CustomSession's default)
+DEFAULT_TIMEOUT = 10
 
 class SQLiScanner:
-    def __init__(self, session):
-        self.session = session
+    def __init__(self, session, max_workers: int = 8, requests_per_second: float = 10, use_http2: bool = False,
+                 parsed_cache: Optional[Dict[str, BeautifulSoup]] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.session = self._pooled_session(session)
+        # Passed on every request: the unwrapped session has no timeout of its own
+        self.timeout = timeout
+        # Optional url -> parsed page dict shared with other scanners to avoid re-parsing
+        self.parsed_cache = parsed_cache
+        self.max_workers = max_workers
+        # HTTP/2 fan-out is opt-in and needs httpx with h2 installed
+        self.use_http2 = use_http2 and HAS_HTTPX
+        self._limiter = HostRateLimiter(requests_per_second)
         self.vulnerable_points = []
         self.payloads = self._load_payloads()
         self.baseline_responses = {}
         
+    @staticmethod
+    def _pooled_session(session) -> requests.Session:
+        """
+        Reuse a requests.Session (or the one wrapped by CustomSession), else the shared pooled one
+
+        Unlike CustomSession, the unwrapped session does not raise on 4xx/5xx,
+        so error pages are classified too - a 500 is often where the SQL error is.
+        """
+        if isinstance(session, requests.Session):
+            return session
+        if isinstance(getattr(session, "session", None), requests.Session):
+            return session.session
+        return SESSION
+
     def _load_payloads(self) -> List[Dict]:
         """Load SQL injection payloads from file"""
         try:
@@ -47,17 +137,102 @@ class SQLiScanner:
                 }
             ]
 
-    def _get_baseline_response(self, url: str, method: str = "GET", data: Dict = None) -> str:
-        """Get baseline response for comparison"""
+    def _get_baseline_length(self, url: str, method: str = "GET", data: Dict = None) -> int:
+        """Get baseline response length for comparison (-1 on failure), fetching each (url, method, data) once"""
+        key = (url, method, tuple(sorted((data or {}).items())))
+        cached = self.baseline_responses.get(key)
+        if cached is not None:
+            return cached
+
         try:
             if method == "GET":
-                response = self.session.get(url)
+                response = self.session.get(url, timeout=self.timeout)
             else:
-                response = self.session.post(url, data=data)
-            return response.text
+                response = self.session.post(url, data=data, timeout=self.timeout)
         except Exception as e:
             print(f"Error getting baseline response: {str(e)}")
-            return ""
+            return -1
+
+        self.baseline_responses[key] = len(response.text)
+        return self.baseline_responses[key]
+
+    def _send_payload(self, method: str, url: str, data: Dict = None) -> Tuple[str, bool, float]:
+        """
+        Send one payload request once the target host's rate limit allows it.
+
+        The body is read here, in the worker, so the connection goes back to
+        the pool straight away. Returns the text read, whether it holds an SQL
+        error signature and the response time in seconds.
+        """
+        self._limiter.acquire(url)
+        # Bodies are streamed so _read_response can stop at the first SQL error
+        if method == "GET":
+            response = self.session.get(url, stream=True, timeout=self.timeout)
+        else:
+            response = self.session.post(url, data=data, stream=True, timeout=self.timeout)
+        response_text, has_sql_error = self._read_response(response)
+        return response_text, has_sql_error, response.elapsed.total_seconds()
+
+    def _send_payloads(self, method: str, requests_args: List[Tuple[str, Optional[Dict]]]) -> List:
+        """
+        Send all payload requests concurrently.
+
+        Returns one entry per (url, data) pair, in order: the
+        (text, has_sql_error, elapsed) tuple of the response, or the exception
+        raised while sending it.
+        """
+        if self.use_http2:
+            return asyncio.run(self._send_payloads_async(method, requests_args))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._send_payload, method, url, data) for url, data in requests_args]
+
+        responses = []
+        for future in futures:
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                responses.append(e)
+        return responses
+
+    async def _send_payloads_async(self, method: str, requests_args: List[Tuple[str, Optional[Dict]]]) -> List:
+        """Send all payload requests multiplexed over one HTTP/2 connection per host"""
+        # Hop-by-hop headers are not allowed in HTTP/2
+        headers = {k: v for k, v in self.session.headers.items() if k.lower() != "connection"}
+        limits = httpx.Limits(max_connections=self.max_workers)
+
+        async with httpx.AsyncClient(http2=True, timeout=self.timeout, limits=limits,
+                                     headers=headers, cookies=self.session.cookies) as client:
+            async def send(url: str, data: Optional[Dict]):
+                await self._limiter.acquire_async(url)
+                if method == "GET":
+                    response = await client.get(url)
+                else:
+                    response = await client.post(url, data=data)
+                # httpx responses are already fully read
+                text = response.text
+                return text, bool(self._check_sql_error(text)), response.elapsed.total_seconds()
+
+            return await asyncio.gather(*(send(url, data) for url, data in requests_args),
+                                        return_exceptions=True)
+
+    @staticmethod
+    def _build_url_template(url: str, param: str, value: str) -> str:
+        """Build a str.format template of url with a {payload} placeholder as the value of param"""
+        parsed_url = urlparse(url)
+        pairs = parse_qsl(parsed_url.query, keep_blank_values=True)
+        if not any(k == param for k, _ in pairs):
+            # Form fields are not in the action URL yet
+            pairs.append((param, value))
+
+        # Encoded pairs cannot contain braces, but the rest of the URL may
+        base = urlunparse(parsed_url._replace(query="", fragment=""))
+        base = base.replace("{", "{{").replace("}", "}}")
+        query = "&".join(
+            f"{quote_plus(k)}={{payload}}" if k == param else urlencode([(k, v)])
+            for k, v in pairs
+        )
+        return f"{base}?{query}"
 
     def test_get_parameter(self, url: str, param: str, value: str) -> Dict:
         """Test a GET parameter for SQL injection vulnerabilities"""
@@ -69,67 +244,18 @@ class SQLiScanner:
             "payloads": []
         }
 
-        # Get baseline response
-        baseline = self._get_baseline_response(url)
-        if not baseline:
+        # Get baseline response length
+        baseline_length = self._get_baseline_length(url)
+        if baseline_length <= 0:
             return results
 
-        for payload in self.payloads:
-            try:
-                # Create a new URL with the payload
-                parsed_url = urlparse(url)
-                params = parse_qs(parsed_url.query)
-                params[param] = [payload["payload"]]
-                
-                # Reconstruct URL with payload
-                new_query = "&".join(f"{k}={v[0]}" for k, v in params.items())
-                test_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?{new_query}"
-                
-                # Send request with payload
-                response = self.session.get(test_url)
-                response_text = response.text
-                
-                # Check for vulnerabilities using multiple methods
-                is_vulnerable = False
-                detection_method = ""
-
-                # 1. Check for SQL errors
-                if self._check_sql_error(response_text):
-                    is_vulnerable = True
-                    detection_method = "Error based"
-
-                # 2. Check for expected results
-                elif payload.get("expected_result") and payload["expected_result"] in response_text:
-                    is_vulnerable = True
-                    detection_method = "Result based"
-
-                # 3. Check for response length difference
-                elif abs(len(response_text) - len(baseline)) > 100:
-                    is_vulnerable = True
-                    detection_method = "Length based"
-
-                # 4. Check for response time
-                elif response.elapsed.total_seconds() > 2:
-                    is_vulnerable = True
-                    detection_method = "Time based"
-
-                if is_vulnerable:
-                    results["vulnerable"] = True
-                    results["payloads"].append({
-                        "name": payload["name"],
-                        "payload": payload["payload"],
-                        "detection_method": detection_method,
-                        "response_length": len(response_text)
-                    })
-                
-                # Add delay to avoid overwhelming the server
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"Error testing GET parameter {param}: {str(e)}")
-                continue
-                
-        return results
+        # Only the tested parameter changes per payload, so build the URL skeleton once
+        url_template = self._build_url_template(url, param, value)
+        test_urls = [url_template.format(payload=quote_plus(payload["payload"])) for payload in self.payloads]
+
+        # Fire all payload requests concurrently, then check them in payload order
+        responses = self._send_payloads("GET", [(test_url, None) for test_url in test_urls])
+        return self._record_findings(results, responses, baseline_length)
 
     def test_post_parameter(self, url: str, form_data: Dict, param: str) -> Dict:
         """Test a POST parameter for SQL injection vulnerabilities"""
@@ -141,46 +267,94 @@ class SQLiScanner:
             "payloads": []
         }
 
-        # Get baseline response
-        baseline = self._get_baseline_response(url, "POST", form_data)
-        if not baseline:
+        # Get baseline response length
+        baseline_length = self._get_baseline_length(url, "POST", form_data)
+        if baseline_length <= 0:
             return results
 
+        # Create a copy of form data per payload and inject it
+        post_requests = []
         for payload in self.payloads:
+            test_data = form_data.copy()
+            test_data[param] = payload["payload"]
+            post_requests.append((url, test_data))
+
+        # Fire all payload requests concurrently, then check them in payload order
+        responses = self._send_payloads("POST", post_requests)
+        return self._record_findings(results, responses, baseline_length)
+
+    def test_form(self, url: str, form_data: Dict, method: str = "POST") -> List[Dict]:
+        """
+        Test every field of a form for SQL injection vulnerabilities.
+
+        The form shares one baseline request, and the payloads for all of its
+        fields are sent as a single concurrent batch. Returns one result per
+        field, in the same format as test_get_parameter/test_post_parameter.
+        """
+        method = method.upper()
+        fields = list(form_data)
+        all_results = [
+            {
+                "url": url,
+                "parameter": field,
+                "method": method,
+                "vulnerable": False,
+                "payloads": []
+            }
+            for field in fields
+        ]
+        if not fields:
+            return all_results
+
+        # Get baseline response length once for the whole form
+        if method == "POST":
+            baseline_length = self._get_baseline_length(url, "POST", form_data)
+        else:
+            baseline_length = self._get_baseline_length(url)
+        if baseline_length <= 0:
+            return all_results
+
+        # One request per field and payload, grouped by field
+        requests_args = []
+        for field in fields:
+            if method == "POST":
+                for payload in self.payloads:
+                    test_data = form_data.copy()
+                    test_data[field] = payload["payload"]
+                    requests_args.append((url, test_data))
+            else:
+                url_template = self._build_url_template(url, field, form_data[field])
+                for payload in self.payloads:
+                    requests_args.append((url_template.format(payload=quote_plus(payload["payload"])), None))
+
+        responses = self._send_payloads(method, requests_args)
+
+        # Partition the responses back into per-field results
+        payload_count = len(self.payloads)
+        for index, results in enumerate(all_results):
+            field_responses = responses[index * payload_count:(index + 1) * payload_count]
+            self._record_findings(results, field_responses, baseline_length)
+
+        return all_results
+
+    def _record_findings(self, results: Dict, responses: List, baseline_length: int) -> Dict:
+        """Check the response to each payload and record the ones that indicate SQL injection"""
+        for payload, response in zip(self.payloads, responses):
+            if isinstance(response, Exception):
+                print(f"Error testing {results['method']} parameter {results['parameter']}: {str(response)}")
+                continue
+
             try:
-                # Create a copy of form data and inject payload
-                test_data = form_data.copy()
-                test_data[param] = payload["payload"]
-                
-                # Send POST request with payload
-                response = self.session.post(url, data=test_data)
-                response_text = response.text
-                
-                # Check for vulnerabilities using multiple methods
-                is_vulnerable = False
-                detection_method = ""
-
-                # 1. Check for SQL errors
-                if self._check_sql_error(response_text):
-                    is_vulnerable = True
-                    detection_method = "Error based"
-
-                # 2. Check for expected results
-                elif payload.get("expected_result") and payload["expected_result"] in response_text:
-                    is_vulnerable = True
-                    detection_method = "Result based"
-
-                # 3. Check for response length difference
-                elif abs(len(response_text) - len(baseline)) > 100:
-                    is_vulnerable = True
-                    detection_method = "Length based"
-
-                # 4. Check for response time
-                elif response.elapsed.total_seconds() > 2:
-                    is_vulnerable = True
-                    detection_method = "Time based"
-
-                if is_vulnerable:
+                response_text, has_sql_error, elapsed = response
+                detection_method = self._classify(
+                    response_text,
+                    baseline_length,
+                    elapsed,
+                    payload.get("expected_result"),
+                    has_sql_error
+                )
+
+                if detection_method:
                     results["vulnerable"] = True
                     results["payloads"].append({
                         "name": payload["name"],
@@ -189,56 +363,78 @@ class SQLiScanner:
                         "response_length": len(response_text)
                     })
                 
-                # Add delay to avoid overwhelming the server
-                time.sleep(0.5)
-                
             except Exception as e:
-                print(f"Error testing POST parameter {param}: {str(e)}")
+                print(f"Error testing {results['method']} parameter {results['parameter']}: {str(e)}")
                 continue
-                
+
         return results
 
+    def _classify(self, text: str, baseline_length: int, elapsed: float,
+                  expected: Optional[str] = None, sql_error: Optional[bool] = None) -> Optional[str]:
+        """
+        Decide whether a payload response indicates SQL injection.
+
+        Returns the detection method, or None if the response looks normal.
+        sql_error can pass in an error check already done while reading the body.
+        """
+        # 1. Check for SQL errors
+        if sql_error is None:
+            sql_error = self._check_sql_error(text)
+        if sql_error:
+            return "Error based"
+
+        # 2. Check for expected results
+        if expected and expected in text:
+            return "Result based"
+
+        # 3. Check for response length difference
+        if abs(len(text) - baseline_length) > 100:
+            return "Length based"
+
+        # 4. Check for response time
+        if elapsed > 2:
+            return "Time based"
+
+        return None
+
+    def _read_response(self, response: requests.Response) -> Tuple[str, bool]:
+        """
+        Read a streamed payload response body, stopping at the first SQL error signature.
+
+        Returns the text read (cut short when an error was found) and whether
+        an SQL error signature was found.
+        """
+        if response.encoding is None:
+            response.encoding = "utf-8"
+
+        parts = []
+        tail = ""
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+                parts.append(chunk)
+                window = tail + chunk
+                if self._check_sql_error(window):
+                    return "".join(parts), True
+                tail = window[-STREAM_OVERLAP:]
+        finally:
+            # Drops the connection if the body was not read to the end
+            response.close()
+
+        return "".join(parts), False
+
     def _check_sql_error(self, response_text: str) -> bool:
         """Check response for SQL error patterns"""
-        error_patterns = [
-            "SQL syntax",
-            "mysql_fetch_array",
-            "mysql_fetch",
-            "mysql_num_rows",
-            "mysql_result",
-            "mysql_query",
-            "mysql error",
-            "ORA-",
-            "SQLite/JDBCDriver",
-            "SQLite.Exception",
-            "System.Data.SQLite.SQLiteException",
-            "Warning: mysql_",
-            "PostgreSQL.*ERROR",
-            "Warning.*pg_",
-            "valid PostgreSQL result",
-            "Npgsql.",
-            "Microsoft SQL Server",
-            "ODBC SQL Server Driver",
-            "SQLServer JDBC Driver",
-            "com.microsoft.sqlserver.jdbc.SQLServerException",
-            "SQLServerException",
-            "Error Occurred While Processing Request",
-            "Server Error in '/' Application",
-            "Unclosed quotation mark after the character string",
-            "Microsoft OLE DB Provider for SQL Server",
-            "SQLServer JDBC Driver",
-            "SQLServerException",
-            "System.Data.SqlClient.SqlException",
-            "Unclosed quotation mark after the character string"
-        ]
-        
-        return any(pattern.lower() in response_text.lower() for pattern in error_patterns)
+        return _SQL_ERROR_LITERALS.search(response_text) or _SQL_ERROR_REGEXES.search(response_text)
 
     def scan_url(self, url: str) -> List[Dict]:
         """Scan a URL for SQL injection vulnerabilities"""
         try:
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parsed_cache.get(url) if self.parsed_cache is not None else None
+            if soup is None:
+                response = self.session.get(url, timeout=self.timeout)
+                soup = BeautifulSoup(response.text, HTML_PARSER)
+                if self.parsed_cache is not None:
+                    self.parsed_cache[url] = soup
             
             # Test GET parameters
             parsed_url = urlparse(url)
@@ -262,13 +458,8 @@ class SQLiScanner:
                     if input_field.get('name'):
                         form_data[input_field['name']] = input_field.get('value', '')
                 
-                # Test each form field
-                for field_name in form_data:
-                    if form_method == 'post':
-                        result = self.test_post_parameter(form_url, form_data, field_name)
-                    else:
-                        result = self.test_get_parameter(form_url, field_name, form_data[field_name])
-                    
+                # Test all form fields in one batch
+                for result in self.test_form(form_url, form_data, "POST" if form_method == 'post' else "GET"):
                     if result["vulnerable"]:
                         self.vulnerable_points.append(result)
             
@@ -1,11 +1,32 @@
 """
 A10 - Server-Side Request Forgery (SSRF) Scanner Module
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import requests
 import re
-import time
-from urllib.parse import urlparse, urljoin
+import threading
+from urllib.parse import urlparse, urljoin, parse_qsl, urlencode, ParseResult
+
+from .matchers import LiteralMatcher
+from .ratelimit import TokenBucket
+from .session import POOL_SIZE
+
+# lxml parses forms in C; BeautifulSoup's html.parser is the fallback
+try:
+    from lxml import etree, html as lxml_html
+    HAS_LXML = True
+except ImportError:
+    from bs4 import BeautifulSoup
+    HAS_LXML = False
+
+# aiohttp is optional - without it (or without a SSRFProbeClient) the probes go over the requests session
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
 
 # List of common internal/private IP ranges and sensitive hosts
 INTERNAL_TARGETS = [
@@ -47,19 +68,185 @@ SSRF_PARAMETERS = [
     'target', 'address', 'domain'
 ]
 
-def check_ssrf(url: str, response: requests.Response, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
+# Distinct payloads sent to URL parameters and to form inputs, built once. The
+# target and payload lists are truncated to keep the number of requests down.
+_PARAM_PROBES = tuple(dict.fromkeys(
+    payload_template.format(target=target)
+    for target in INTERNAL_TARGETS[:3] for payload_template in SSRF_PAYLOADS[:3]
+))
+_FORM_PROBES = tuple(dict.fromkeys(
+    payload_template.format(target=target)
+    for target in INTERNAL_TARGETS[:2] for payload_template in SSRF_PAYLOADS[:2]
+))
+
+# Finds any of the parameter names above inside a (case-insensitive) field name in one pass
+_SSRF_PARAM_MATCHER = LiteralMatcher(SSRF_PARAMETERS)
+
+# Indicators of a successful SSRF in a probe's response body
+SSRF_INDICATORS = [
+    # AWS metadata indicators
+    r'ami-id|instance-id|instance-type',
+    r'availability-zone|region',
+    r'security-credentials',
+
+    # GCP metadata indicators
+    r'project-id|numeric-project-id',
+    r'instance/service-accounts',
+
+    # Azure metadata indicators
+    r'compute.internal|metadata.azure.com',
+    r'metadata/instance',
+
+    # Common internal service indicators
+    r'<html>|<!doctype|<body>',  # HTML responses from internal services
+    r'<title>.*dashboard|admin|console',
+    r'<h1>.*dashboard|admin|console',
+
+    # Database-like responses
+    r'mysql|postgresql|oracle|mongodb|redis',
+    r'database error|db error|connection error',
+
+    # System file indicators (for file:// protocol)
+    r'root:|nobody:|daemon:|bin:|sys:',  # /etc/passwd entries
+    r'home/[^/]+:|usr/[^/]+:',
+
+    # Internal error messages that suggest SSRF worked
+    r'internal server error.*url|request to.*failed',
+    r'could not connect to|connection refused',
+    r'no route to host|host unreachable',
+
+    # Port-specific services
+    r'ssh-.*key-exchange|protocol mismatch',  # SSH (port 22)
+    r'mysql handshake|sql server',  # Database ports
+    r'memcached|redis',  # Cache services
+]
+
+# Every indicator in one case-insensitive pass over the body
+_SSRF_INDICATORS_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in SSRF_INDICATORS), re.IGNORECASE)
+
+# Only the start of a probe response is searched for indicators
+MAX_INDICATOR_SCAN_BYTES = 256 * 1024
+
+# Content types worth searching; other bodies (images, archives, ...) can't hold the indicators
+_TEXT_CONTENT_TYPES = ('text/', 'json', 'xml', 'x-www-form-urlencoded')
+
+# Path segments that mark a URL as an API endpoint
+_API_HINT_RE = re.compile(r'/(?:api|v[12]|rest|graphql)(?:/|$)', re.IGNORECASE)
+
+# Common API endpoints that might be vulnerable to SSRF
+API_ENDPOINTS = [
+    '/fetch', '/proxy', '/import', '/export', '/load', '/url', 
+    '/preview', '/download', '/upload', '/webhook', '/callback'
+]
+
+# Maximum number of SSRF probes in flight at once on the aiohttp path
+SSRF_CONCURRENCY = 10
+
+# Seconds to wait for the HEAD request that checks an API endpoint exists
+HEAD_TIMEOUT = 2
+
+# Status codes of a HEAD request meaning the API endpoint does not exist. 405 is not
+# one of them: POST-only endpoints answer HEAD with 405 and are still worth probing.
+MISSING_ENDPOINT_STATUSES = (404, 410)
+
+# Guards the probed_apis sets shared between checks
+_probed_apis_lock = threading.Lock()
+
+# Probe URLs longer than this are not sent
+MAX_PROBE_URL_LENGTH = 2000
+
+# Seconds before a single SSRF probe is abandoned
+PROBE_TIMEOUT = 5
+
+# Keep-alive connections the aiohttp probes may hold open to one host
+PROBE_CONNECTIONS_PER_HOST = 16
+
+# Used when the caller does not share its own limiter: bursts of 5, then 2 probes/s
+_DEFAULT_LIMITER = TokenBucket(capacity=5, rate=2.0)
+
+SSRF_RECOMMENDATION = 'Implement URL validation and whitelist of allowed domains/IPs'
+SSRF_CONSEQUENCES = 'SSRF vulnerabilities can allow attackers to make requests to internal services, access sensitive data, or use the server as a proxy for attacks on other systems.'
+
+def _parameter_vulnerability(param_name: str, payload: str, param_value: str) -> Dict[str, Any]:
+    """Build the finding for an SSRF-vulnerable URL parameter"""
+    return {
+        'type': 'ssrf_url_parameter',
+        'details': {
+            'parameter': param_name,
+            'payload': payload,
+            'original_value': param_value,
+            'description': f"SSRF vulnerability detected in URL parameter '{param_name}'",
+            'severity': 'High',
+            'recommendation': SSRF_RECOMMENDATION,
+            'consequences': SSRF_CONSEQUENCES
+        }
+    }
+
+def _form_vulnerability(form_action: str, form_method: str, input_name: str, payload: str) -> Dict[str, Any]:
+    """Build the finding for an SSRF-vulnerable form input"""
+    return {
+        'type': 'ssrf_form_input',
+        'details': {
+            'form_action': form_action,
+            'form_method': form_method,
+            'input_name': input_name,
+            'payload': payload,
+            'description': f"SSRF vulnerability detected in form input '{input_name}'",
+            'severity': 'High',
+            'recommendation': SSRF_RECOMMENDATION,
+            'consequences': SSRF_CONSEQUENCES
+        }
+    }
+
+def _api_vulnerability(endpoint: str, payload: str, method: str) -> Dict[str, Any]:
+    """Build the finding for an SSRF-vulnerable API endpoint"""
+    details = {
+        'endpoint': endpoint,
+        'payload': payload,
+        'method': method
+    }
+    if method == 'POST':
+        details['content_type'] = 'application/json'
+    details.update({
+        'description': f"SSRF vulnerability detected in API endpoint '{endpoint}'",
+        'severity': 'High',
+        'recommendation': SSRF_RECOMMENDATION,
+        'consequences': SSRF_CONSEQUENCES
+    })
+    return {
+        'type': 'ssrf_api_endpoint',
+        'details': details
+    }
+
+def check_ssrf(url: str, response: requests.Response, session: requests.Session, log_func=None,
+               limiter: Optional[TokenBucket] = None,
+               probed_apis: Optional[Set[Tuple[str, str]]] = None,
+               probe_client: Optional['SSRFProbeClient'] = None) -> List[Dict[str, Any]]:
     """
     Check for Server-Side Request Forgery (SSRF) vulnerabilities
     
     Args:
         url: The URL to check
         response: The HTTP response
-        session: The requests session for additional requests
+        session: The requests session for additional requests. It should be
+            long-lived and pooled (see session.create_pooled_session) so the
+            probes reuse keep-alive connections instead of reconnecting.
         log_func: Optional logging function
+        limiter: Token bucket throttling the probes, shared across calls
+        probed_apis: (base_url, endpoint) pairs already probed, shared across calls so
+            each API endpoint of a host is only probed once per scan
+        probe_client: Scan-wide aiohttp client (see create_probe_client); when given,
+            the probes are sent concurrently over its connections
     
     Returns:
         List of vulnerabilities found
     """
+    limiter = limiter or _DEFAULT_LIMITER
+    
+    # Blocking on the client's loop from inside another running loop would stall that loop
+    if probe_client is not None and not _in_event_loop():
+        return probe_client.check(url, response, log_func, limiter, probed_apis)
+    
     vulnerabilities = []
     
     if log_func:
@@ -67,34 +254,52 @@ def check_ssrf(url: str, response: requests.Response, session: requests.Session,
     
     # 1. Check URL parameters for potential SSRF
     parsed_url = urlparse(url)
-    query_params = parsed_url.query.split('&')
-    
-    for param in query_params:
-        if not param:
-            continue
-        
-        parts = param.split('=', 1)
-        if len(parts) != 2:
-            continue
-        
-        param_name, param_value = parts
-        
-        # If parameter name suggests it might accept a URL
-        if any(target in param_name.lower() for target in SSRF_PARAMETERS):
-            ssrf_vulns = check_parameter_for_ssrf(url, param_name, param_value, session, log_func)
-            vulnerabilities.extend(ssrf_vulns)
+    params = parse_qsl(parsed_url.query, keep_blank_values=True)
+    for param_name, param_value in _ssrf_candidate_params(params):
+        ssrf_vulns = check_parameter_for_ssrf(url, param_name, param_value, session, log_func, limiter,
+                                              parsed_url=parsed_url, params=params)
+        vulnerabilities.extend(ssrf_vulns)
     
     # 2. Check forms for potential SSRF
-    form_vulns = check_forms_for_ssrf(url, response, session, log_func)
+    form_vulns = check_forms_for_ssrf(url, response, session, log_func, limiter)
     vulnerabilities.extend(form_vulns)
     
     # 3. Check API endpoints for SSRF
-    api_vulns = check_api_for_ssrf(url, session, log_func)
+    api_vulns = check_api_for_ssrf(url, session, log_func, limiter, probed_apis)
     vulnerabilities.extend(api_vulns)
     
     return vulnerabilities
 
-def check_parameter_for_ssrf(url: str, param_name: str, param_value: str, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
+def _ssrf_candidate_params(params: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Return the (name, value) query parameters whose name suggests they accept a URL"""
+    return [(param_name, param_value) for param_name, param_value in params
+            if _SSRF_PARAM_MATCHER.search(param_name)]
+
+def _parameter_probes(parsed_url: ParseResult, params: List[Tuple[str, str]], param_name: str,
+                      log_func=None) -> Tuple[List[str], List[tuple]]:
+    """Build the payloads and (method, url, kwargs) probes that inject SSRF payloads into param_name"""
+    payloads = []
+    probes = []
+    for payload in _PARAM_PROBES:
+        # Replace the original value with our payload
+        query = urlencode([(name, payload if name == param_name else value) for name, value in params])
+        modified_url = parsed_url._replace(query=query).geturl()
+        
+        # If the URL is too long, skip it
+        if len(modified_url) > MAX_PROBE_URL_LENGTH:
+            continue
+        
+        if log_func:
+            log_func(f"Testing SSRF with payload: {payload} in parameter {param_name}")
+        
+        payloads.append(payload)
+        probes.append(('GET', modified_url, {}))
+    
+    return payloads, probes
+
+def check_parameter_for_ssrf(url: str, param_name: str, param_value: str, session: requests.Session, log_func=None,
+                             limiter: Optional[TokenBucket] = None, parsed_url: Optional[ParseResult] = None,
+                             params: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
     """
     Check a URL parameter for SSRF vulnerability
     
@@ -104,10 +309,14 @@ def check_parameter_for_ssrf(url: str, param_name: str, param_value: str, sessio
         param_value: The parameter value
         session: The requests session
         log_func: Optional logging function
+        limiter: Token bucket throttling the probes
+        parsed_url: urlparse(url), when the caller already has it
+        params: parse_qsl of the URL's query, when the caller already has it
     
     Returns:
         List of vulnerabilities found
     """
+    limiter = limiter or _DEFAULT_LIMITER
     vulnerabilities = []
     
     # Only test parameters that look like they might be URLs
@@ -115,57 +324,79 @@ def check_parameter_for_ssrf(url: str, param_name: str, param_value: str, sessio
             param_value.startswith('//')):
         return vulnerabilities
     
-    # Try to inject SSRF payloads
-    for target in INTERNAL_TARGETS[:3]:  # Limit targets to reduce requests
-        for payload_template in SSRF_PAYLOADS[:3]:  # Limit payloads to reduce requests
-            payload = payload_template.format(target=target)
+    if parsed_url is None:
+        parsed_url = urlparse(url)
+    if params is None:
+        params = parse_qsl(parsed_url.query, keep_blank_values=True)
+    payloads, probes = _parameter_probes(parsed_url, params, param_name, log_func)
+    
+    # Send the probes from a thread pool and stop at the first success
+    index = _first_successful_probe_sync(session, limiter, probes,
+                                         f"Error testing SSRF in parameter {param_name}", log_func)
+    if index is not None:
+        vulnerabilities.append(_parameter_vulnerability(param_name, payloads[index], param_value))
+        
+        if log_func:
+            log_func(f"SSRF vulnerability found in parameter {param_name} at {url}")
+    
+    return vulnerabilities
+
+def _first_successful_probe_sync(session: requests.Session, limiter: TokenBucket, probes: List[tuple],
+                                 error_message: str, log_func=None) -> Optional[int]:
+    """
+    Send (method, url, kwargs) probes from a thread pool
+    
+    Tokens are taken as the probes are submitted. Once one probe indicates
+    SSRF no further probes are submitted and those still queued are cancelled.
+    
+    Returns:
+        Index of the first probe to complete that indicates SSRF, or None
+    """
+    def send(method: str, probe_url: str, kwargs: Dict[str, Any]) -> bool:
+        test_response = session.request(method, probe_url, timeout=PROBE_TIMEOUT, allow_redirects=False, **kwargs)
+        return is_ssrf_successful(test_response)
+    
+    def succeeded(future: Future) -> bool:
+        try:
+            return future.result()
+        except Exception as e:
+            if log_func:
+                log_func(f"{error_message}: {str(e)}")
+            return False
+    
+    futures: Dict[Future, int] = {}
+    unchecked = set()
+    hit = None
+    with ThreadPoolExecutor(max_workers=SSRF_CONCURRENCY) as executor:
+        for index, (method, probe_url, kwargs) in enumerate(probes):
+            limiter.acquire()
             
-            # Replace the original value with our payload
-            modified_url = url.replace(f"{param_name}={param_value}", f"{param_name}={payload}")
+            # Stop submitting once a finished probe has already found SSRF
+            for future in [future for future in unchecked if future.done()]:
+                unchecked.discard(future)
+                if hit is None and succeeded(future):
+                    hit = futures[future]
+            if hit is not None:
+                break
             
-            try:
-                # If the URL got corrupted or is too long, skip it
-                if len(modified_url) > 2000 or '=' not in modified_url:
-                    continue
-                
-                if log_func:
-                    log_func(f"Testing SSRF with payload: {payload} in parameter {param_name}")
-                
-                # Make the request with the modified parameter
-                test_response = session.get(modified_url, timeout=5, allow_redirects=False)
-                
-                # Check for signs of successful SSRF
-                if is_ssrf_successful(test_response):
-                    vuln_data = {
-                        'type': 'ssrf_url_parameter',
-                        'details': {
-                            'parameter': param_name,
-                            'payload': payload,
-                            'original_value': param_value,
-                            'description': f"SSRF vulnerability detected in URL parameter '{param_name}'",
-                            'severity': 'High',
-                            'recommendation': 'Implement URL validation and whitelist of allowed domains/IPs',
-                            'consequences': 'SSRF vulnerabilities can allow attackers to make requests to internal services, access sensitive data, or use the server as a proxy for attacks on other systems.'
-                        }
-                    }
-                    vulnerabilities.append(vuln_data)
-                    
-                    if log_func:
-                        log_func(f"SSRF vulnerability found in parameter {param_name} at {url}")
-                    
-                    # Found a vulnerability, no need to test more payloads for this parameter
-                    return vulnerabilities
-                
-                # Rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                if log_func:
-                    log_func(f"Error testing SSRF in parameter {param_name}: {str(e)}")
+            future = executor.submit(send, method, probe_url, kwargs)
+            futures[future] = index
+            unchecked.add(future)
+        
+        if hit is None:
+            for future in as_completed(unchecked):
+                if succeeded(future):
+                    hit = futures[future]
+                    break
+        
+        # Probes that have not started yet are dropped
+        for future in futures:
+            future.cancel()
     
-    return vulnerabilities
+    return hit
 
-def check_forms_for_ssrf(url: str, response: requests.Response, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
+def check_forms_for_ssrf(url: str, response: requests.Response, session: requests.Session, log_func=None,
+                         limiter: Optional[TokenBucket] = None) -> List[Dict[str, Any]]:
     """
     Check forms for SSRF vulnerability
     
@@ -174,10 +405,12 @@ def check_forms_for_ssrf(url: str, response: requests.Response, session: request
         response: The HTTP response
         session: The requests session
         log_func: Optional logging function
+        limiter: Token bucket throttling the probes
     
     Returns:
         List of vulnerabilities found
     """
+    limiter = limiter or _DEFAULT_LIMITER
     vulnerabilities = []
     
     # Extract forms from the response
@@ -205,65 +438,63 @@ def check_forms_for_ssrf(url: str, response: requests.Response, session: request
                 continue
             
             # Check if input name suggests it might accept a URL
-            if any(target in input_name.lower() for target in SSRF_PARAMETERS):
+            if _SSRF_PARAM_MATCHER.search(input_name):
                 # Try SSRF payloads in this input
-                for target in INTERNAL_TARGETS[:2]:  # Limit targets to reduce requests
-                    for payload_template in SSRF_PAYLOADS[:2]:  # Limit payloads to reduce requests
-                        payload = payload_template.format(target=target)
+                for payload in _FORM_PROBES:
+                    # Prepare form data with our payload
+                    form_data = {}
+                    for field in form.get('inputs', []):
+                        field_name = field.get('name', '')
+                        if field_name == input_name:
+                            form_data[field_name] = payload
+                        elif field.get('type') not in ['submit', 'button', 'image']:
+                            # Fill other fields with dummy data
+                            form_data[field_name] = 'test'
+                    
+                    try:
+                        if log_func:
+                            log_func(f"Testing SSRF with payload: {payload} in form input {input_name}")
                         
-                        # Prepare form data with our payload
-                        form_data = {}
-                        for field in form.get('inputs', []):
-                            field_name = field.get('name', '')
-                            if field_name == input_name:
-                                form_data[field_name] = payload
-                            elif field.get('type') not in ['submit', 'button', 'image']:
-                                # Fill other fields with dummy data
-                                form_data[field_name] = 'test'
+                        # Submit the form
+                        limiter.acquire()
+                        if form_method == 'get':
+                            test_response = session.get(form_action, params=form_data, timeout=5, allow_redirects=False)
+                        else:
+                            test_response = session.post(form_action, data=form_data, timeout=5, allow_redirects=False)
                         
-                        try:
-                            if log_func:
-                                log_func(f"Testing SSRF with payload: {payload} in form input {input_name}")
-                            
-                            # Submit the form
-                            if form_method == 'get':
-                                test_response = session.get(form_action, params=form_data, timeout=5, allow_redirects=False)
-                            else:
-                                test_response = session.post(form_action, data=form_data, timeout=5, allow_redirects=False)
+                        # Check for signs of successful SSRF
+                        if is_ssrf_successful(test_response):
+                            vulnerabilities.append(_form_vulnerability(form_action, form_method, input_name, payload))
                             
-                            # Check for signs of successful SSRF
-                            if is_ssrf_successful(test_response):
-                                vuln_data = {
-                                    'type': 'ssrf_form_input',
-                                    'details': {
-                                        'form_action': form_action,
-                                        'form_method': form_method,
-                                        'input_name': input_name,
-                                        'payload': payload,
-                                        'description': f"SSRF vulnerability detected in form input '{input_name}'",
-                                        'severity': 'High',
-                                        'recommendation': 'Implement URL validation and whitelist of allowed domains/IPs',
-                                        'consequences': 'SSRF vulnerabilities can allow attackers to make requests to internal services, access sensitive data, or use the server as a proxy for attacks on other systems.'
-                                    }
-                                }
-                                vulnerabilities.append(vuln_data)
-                                
-                                if log_func:
-                                    log_func(f"SSRF vulnerability found in form input {input_name} at {url}")
-                                
-                                # Found a vulnerability, no need to test more payloads for this input
-                                break
-                            
-                            # Rate limiting
-                            time.sleep(0.5)
-                            
-                        except Exception as e:
                             if log_func:
-                                log_func(f"Error testing SSRF in form input {input_name}: {str(e)}")
+                                log_func(f"SSRF vulnerability found in form input {input_name} at {url}")
+                            
+                            # Found a vulnerability, no need to test more payloads for this input
+                            break
+                        
+                    except Exception as e:
+                        if log_func:
+                            log_func(f"Error testing SSRF in form input {input_name}: {str(e)}")
     
     return vulnerabilities
 
-def check_api_for_ssrf(url: str, session: requests.Session, log_func=None) -> List[Dict[str, Any]]:
+def _is_api_url(parsed_url) -> bool:
+    """Check if a parsed URL looks like an API endpoint"""
+    return _API_HINT_RE.search(parsed_url.path) is not None
+
+def _claim_api_endpoints(base_url: str, probed_apis: Optional[Set[Tuple[str, str]]]) -> List[str]:
+    """Return the API endpoints of base_url not in probed_apis yet and add them to it"""
+    if probed_apis is None:
+        return list(API_ENDPOINTS)
+    
+    with _probed_apis_lock:
+        endpoints = [endpoint for endpoint in API_ENDPOINTS if (base_url, endpoint) not in probed_apis]
+        probed_apis.update((base_url, endpoint) for endpoint in endpoints)
+    return endpoints
+
+def check_api_for_ssrf(url: str, session: requests.Session, log_func=None,
+                       limiter: Optional[TokenBucket] = None,
+                       probed_apis: Optional[Set[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
     """
     Check API endpoints for SSRF vulnerability
     
@@ -271,30 +502,36 @@ def check_api_for_ssrf(url: str, session: requests.Session, log_func=None) -> Li
         url: The URL to check
         session: The requests session
         log_func: Optional logging function
+        limiter: Token bucket throttling the probes
+        probed_apis: (base_url, endpoint) pairs to skip; the endpoints probed here are added
     
     Returns:
         List of vulnerabilities found
     """
+    limiter = limiter or _DEFAULT_LIMITER
     vulnerabilities = []
     
     # Check if URL looks like an API endpoint
     parsed_url = urlparse(url)
-    path = parsed_url.path.lower()
-    
-    if not ('/api' in path or '/v1' in path or '/v2' in path or '/rest' in path or '/graphql' in path):
+    if not _is_api_url(parsed_url):
         return vulnerabilities
     
-    # Try common API endpoints that might be vulnerable to SSRF
-    api_endpoints = [
-        '/fetch', '/proxy', '/import', '/export', '/load', '/url', 
-        '/preview', '/download', '/upload', '/webhook', '/callback'
-    ]
-    
     base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
     
-    for endpoint in api_endpoints:
+    for endpoint in _claim_api_endpoints(base_url, probed_apis):
         endpoint_url = urljoin(base_url, endpoint)
         
+        # A cheap HEAD request rules out endpoints that do not exist
+        try:
+            limiter.acquire()
+            head_response = session.head(endpoint_url, timeout=HEAD_TIMEOUT, allow_redirects=False)
+            if head_response.status_code in MISSING_ENDPOINT_STATUSES:
+                continue
+        except Exception as e:
+            if log_func:
+                log_func(f"Error checking API endpoint {endpoint}: {str(e)}")
+            continue
+        
         # Try SSRF payloads
         for target in INTERNAL_TARGETS[:2]:  # Limit targets to reduce requests
             payload = f"http://{target}/"
@@ -307,21 +544,10 @@ def check_api_for_ssrf(url: str, session: requests.Session, log_func=None) -> Li
                     log_func(f"Testing SSRF with payload: {payload} at API endpoint {endpoint}")
                 
                 # GET request
+                limiter.acquire()
                 test_response = session.get(param_url, timeout=5, allow_redirects=False)
                 if is_ssrf_successful(test_response):
-                    vuln_data = {
-                        'type': 'ssrf_api_endpoint',
-                        'details': {
-                            'endpoint': endpoint,
-                            'payload': payload,
-                            'method': 'GET',
-                            'description': f"SSRF vulnerability detected in API endpoint '{endpoint}'",
-                            'severity': 'High',
-                            'recommendation': 'Implement URL validation and whitelist of allowed domains/IPs',
-                            'consequences': 'SSRF vulnerabilities can allow attackers to make requests to internal services, access sensitive data, or use the server as a proxy for attacks on other systems.'
-                        }
-                    }
-                    vulnerabilities.append(vuln_data)
+                    vulnerabilities.append(_api_vulnerability(endpoint, payload, 'GET'))
                     
                     if log_func:
                         log_func(f"SSRF vulnerability found in API endpoint {endpoint} at {url}")
@@ -333,22 +559,10 @@ def check_api_for_ssrf(url: str, session: requests.Session, log_func=None) -> Li
                 json_data = {'url': payload}
                 
                 # POST request with JSON
+                limiter.acquire()
                 test_response = session.post(endpoint_url, json=json_data, timeout=5, allow_redirects=False)
                 if is_ssrf_successful(test_response):
-                    vuln_data = {
-                        'type': 'ssrf_api_endpoint',
-                        'details': {
-                            'endpoint': endpoint,
-                            'payload': payload,
-                            'method': 'POST',
-                            'content_type': 'application/json',
-                            'description': f"SSRF vulnerability detected in API endpoint '{endpoint}'",
-                            'severity': 'High',
-                            'recommendation': 'Implement URL validation and whitelist of allowed domains/IPs',
-                            'consequences': 'SSRF vulnerabilities can allow attackers to make requests to internal services, access sensitive data, or use the server as a proxy for attacks on other systems.'
-                        }
-                    }
-                    vulnerabilities.append(vuln_data)
+                    vulnerabilities.append(_api_vulnerability(endpoint, payload, 'POST'))
                     
                     if log_func:
                         log_func(f"SSRF vulnerability found in API endpoint {endpoint} at {url}")
@@ -356,9 +570,6 @@ def check_api_for_ssrf(url: str, session: requests.Session, log_func=None) -> Li
                     # Found a vulnerability, no need to test more payloads for this endpoint
                     break
                 
-                # Rate limiting
-                time.sleep(0.5)
-                
             except Exception as e:
                 if log_func:
                     log_func(f"Error testing SSRF in API endpoint {endpoint}: {str(e)}")
@@ -375,57 +586,32 @@ def is_ssrf_successful(response: requests.Response) -> bool:
     Returns:
         True if SSRF was successful, False otherwise
     """
-    if response is None:
+    if response is None or not _worth_scanning(response.status_code, response.headers.get('Content-Type', '')):
         return False
     
+    return _ssrf_indicators_found(response.content[:MAX_INDICATOR_SCAN_BYTES])
+
+def _worth_scanning(status_code: int, content_type: str) -> bool:
+    """Check whether a probe's status code and content type allow a successful SSRF"""
     # Check response code
-    if response.status_code in [200, 201, 202]:
-        content = response.text.lower()
-        
-        # Check for indicators of successful SSRF
-        ssrf_indicators = [
-            # AWS metadata indicators
-            r'ami-id|instance-id|instance-type',
-            r'availability-zone|region',
-            r'security-credentials',
-            
-            # GCP metadata indicators
-            r'project-id|numeric-project-id',
-            r'instance/service-accounts',
-            
-            # Azure metadata indicators
-            r'compute.internal|metadata.azure.com',
-            r'metadata/instance',
-            
-            # Common internal service indicators
-            r'<html>|<!doctype|<body>',  # HTML responses from internal services
-            r'<title>.*dashboard|admin|console',
-            r'<h1>.*dashboard|admin|console',
-            
-            # Database-like responses
-            r'mysql|postgresql|oracle|mongodb|redis',
-            r'database error|db error|connection error',
-            
-            # System file indicators (for file:// protocol)
-            r'root:|nobody:|daemon:|bin:|sys:',  # /etc/passwd entries
-            r'home/[^/]+:|usr/[^/]+:',
-            
-            # Internal error messages that suggest SSRF worked
-            r'internal server error.*url|request to.*failed',
-            r'could not connect to|connection refused',
-            r'no route to host|host unreachable',
-            
-            # Port-specific services
-            r'ssh-.*key-exchange|protocol mismatch',  # SSH (port 22)
-            r'mysql handshake|sql server',  # Database ports
-            r'memcached|redis',  # Cache services
-        ]
-        
-        for pattern in ssrf_indicators:
-            if re.search(pattern, content):
-                return True
+    if status_code not in [200, 201, 202]:
+        return False
     
-    return False
+    # Responses without a content type are searched too: raw services rarely send one
+    content_type = content_type.lower()
+    return not content_type or any(t in content_type for t in _TEXT_CONTENT_TYPES)
+
+def _ssrf_indicators_found(body: bytes) -> bool:
+    """
+    Check the start of a probe's body for signs of a successful SSRF
+    
+    Args:
+        body: Up to MAX_INDICATOR_SCAN_BYTES of the response body
+    
+    Returns:
+        True if SSRF was successful, False otherwise
+    """
+    return _SSRF_INDICATORS_RE.search(body.decode('utf-8', 'ignore')) is not None
 
 def extract_forms(response: requests.Response) -> List[Dict[str, Any]]:
     """
@@ -438,30 +624,387 @@ def extract_forms(response: requests.Response) -> List[Dict[str, Any]]:
         List of forms with their attributes
     """
     forms = []
-    content = response.text
-    
-    # Very basic form extraction - in a real scanner, use a proper HTML parser
-    form_pattern = r'<form[^>]*action=["\']([^"\']*)["\'][^>]*method=["\']([^"\']*)["\'][^>]*>(.*?)</form>'
-    input_pattern = r'<input[^>]*name=["\']([^"\']*)["\'][^>]*type=["\']([^"\']*)["\'][^>]*>'
-    
-    for form_match in re.finditer(form_pattern, content, re.DOTALL | re.IGNORECASE):
-        action = form_match.group(1)
-        method = form_match.group(2)
-        form_content = form_match.group(3)
-        
+    for form, fields in _iter_form_elements(response):
         inputs = []
-        for input_match in re.finditer(input_pattern, form_content, re.DOTALL | re.IGNORECASE):
-            name = input_match.group(1)
-            input_type = input_match.group(2)
+        for field in fields:
+            name = field.get('name')
+            if not name:
+                continue
             inputs.append({
                 'name': name,
-                'type': input_type
+                'type': (field.get('type') or 'text').lower()
             })
         
         forms.append({
-            'action': action,
-            'method': method,
+            'action': form.get('action') or '',
+            'method': (form.get('method') or 'get').lower(),
             'inputs': inputs
         })
     
     return forms
+
+def _iter_form_elements(response: requests.Response):
+    """Yield each <form> element of the response with its input, textarea and select elements"""
+    if not response.content:
+        return
+    
+    if HAS_LXML:
+        try:
+            document = lxml_html.fromstring(response.content)
+        except (etree.ParserError, ValueError):
+            return
+        for form in document.iter('form'):
+            yield form, form.iter('input', 'textarea', 'select')
+    else:
+        soup = BeautifulSoup(response.text, 'html.parser')
+        for form in soup.find_all('form'):
+            yield form, form.find_all(['input', 'textarea', 'select'])
+
+def _in_event_loop() -> bool:
+    """Check if the caller is already running inside an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+class SSRFProbeClient:
+    """
+    One aiohttp session and event loop shared by the SSRF checks of a whole scan
+    
+    The loop runs in a daemon thread, so check_ssrf can hand it work from any
+    crawler thread, and the connection pool and DNS cache outlive each URL.
+    Headers and TLS verification are taken from the requests session when the
+    client starts; its cookies are copied in before every check. Call close()
+    when the scan ends.
+    """
+    
+    def __init__(self, session: requests.Session):
+        self._session = session
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional['aiohttp.ClientSession'] = None
+    
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread and the aiohttp session on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='ssrf-probes', daemon=True)
+                thread.start()
+                # aiohttp sessions must be created inside the loop they run on
+                self._client = asyncio.run_coroutine_threadsafe(self._create_client(), loop).result()
+                self._loop, self._thread = loop, thread
+            return self._loop
+    
+    async def _create_client(self) -> 'aiohttp.ClientSession':
+        # aiohttp negotiates its own encoding and connection handling
+        headers = {k: v for k, v in getattr(self._session, 'headers', {}).items()
+                   if k.lower() not in ('accept-encoding', 'connection')}
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, limit_per_host=PROBE_CONNECTIONS_PER_HOST,
+                                         use_dns_cache=True, ttl_dns_cache=300,
+                                         ssl=None if getattr(self._session, 'verify', True) else False)
+        return aiohttp.ClientSession(headers=headers, connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT))
+    
+    def check(self, url: str, response: requests.Response, log_func=None,
+              limiter: Optional[TokenBucket] = None,
+              probed_apis: Optional[Set[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+        """Run check_ssrf_async for url on the shared loop and wait for its findings"""
+        loop = self._start()
+        cookies = {cookie.name: cookie.value for cookie in getattr(self._session, 'cookies', [])}
+        
+        async def run() -> List[Dict[str, Any]]:
+            if cookies:
+                self._client.cookie_jar.update_cookies(cookies)
+            return await check_ssrf_async(url, response, self._client, log_func,
+                                          limiter=limiter, probed_apis=probed_apis)
+        
+        return asyncio.run_coroutine_threadsafe(run(), loop).result()
+    
+    def close(self) -> None:
+        """Close the aiohttp session and stop the loop thread"""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+def create_probe_client(session: requests.Session) -> Optional[SSRFProbeClient]:
+    """
+    Create the scan-wide probe client for check_ssrf, or None if the probes
+    must stay on the requests session: without aiohttp, or when the session
+    uses proxies (the aiohttp client does not apply them)
+    """
+    if not HAS_AIOHTTP or getattr(session, 'proxies', None):
+        return None
+    return SSRFProbeClient(session)
+
+async def check_ssrf_async(url: str, response: requests.Response, session: 'aiohttp.ClientSession', log_func=None,
+                           concurrency: int = SSRF_CONCURRENCY,
+                           limiter: Optional[TokenBucket] = None,
+                           probed_apis: Optional[Set[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Check for SSRF vulnerabilities, sending all probes concurrently
+    
+    Same checks and findings as check_ssrf, but every probe for the URL is
+    in flight at once (bounded by concurrency) instead of one after another.
+    
+    Args:
+        url: The URL to check
+        response: The HTTP response
+        session: The aiohttp session for the probe requests
+        log_func: Optional logging function
+        concurrency: Maximum number of probes in flight
+        limiter: Token bucket throttling the probes, shared across calls
+        probed_apis: (base_url, endpoint) pairs already probed, shared across calls
+    
+    Returns:
+        List of vulnerabilities found
+    """
+    limiter = limiter or _DEFAULT_LIMITER
+    
+    if log_func:
+        log_func(f"Checking for SSRF vulnerabilities at {url}")
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    parsed_url = urlparse(url)
+    params = parse_qsl(parsed_url.query, keep_blank_values=True)
+    
+    checks = [
+        check_parameter_for_ssrf_async(url, param_name, param_value, session, semaphore, limiter, log_func,
+                                       parsed_url=parsed_url, params=params)
+        for param_name, param_value in _ssrf_candidate_params(params)
+    ]
+    checks.append(check_forms_for_ssrf_async(url, response, session, semaphore, limiter, log_func))
+    checks.append(check_api_for_ssrf_async(url, session, semaphore, limiter, log_func, probed_apis))
+    
+    # Results keep the check order: parameters, then forms, then API endpoints
+    vulnerabilities = []
+    for check_vulns in await asyncio.gather(*checks):
+        vulnerabilities.extend(check_vulns)
+    
+    return vulnerabilities
+
+async def _probe(session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore, limiter: TokenBucket,
+                 method: str, url: str, **kwargs) -> bool:
+    """Send one SSRF probe and check the response for signs of success"""
+    await limiter.acquire_async()
+    async with semaphore:
+        async with session.request(method, url, allow_redirects=False, **kwargs) as probe_response:
+            if not _worth_scanning(probe_response.status, probe_response.headers.get('Content-Type', '')):
+                return False
+            
+            return _ssrf_indicators_found(await _read_head(probe_response.content, MAX_INDICATOR_SCAN_BYTES))
+
+async def _read_head(stream: 'aiohttp.StreamReader', limit: int) -> bytes:
+    """Read at most limit bytes from the start of a response body"""
+    # StreamReader.read(n) returns whatever is buffered, so keep reading until limit or EOF
+    chunks = []
+    remaining = limit
+    while remaining > 0:
+        chunk = await stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+async def _first_successful_probe(session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore, limiter: TokenBucket,
+                                  probes: List[tuple], error_message: str, log_func=None) -> Optional[int]:
+    """
+    Send (method, url, kwargs) probes concurrently
+    
+    Returns:
+        Index of the first probe, in list order, that indicates SSRF, or None
+    """
+    results = await asyncio.gather(
+        *(_probe(session, semaphore, limiter, method, probe_url, **kwargs) for method, probe_url, kwargs in probes),
+        return_exceptions=True
+    )
+    
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            if log_func:
+                log_func(f"{error_message}: {str(result)}")
+        elif result:
+            return index
+    
+    return None
+
+async def check_parameter_for_ssrf_async(url: str, param_name: str, param_value: str, session: 'aiohttp.ClientSession',
+                                         semaphore: asyncio.Semaphore, limiter: TokenBucket, log_func=None,
+                                         parsed_url: Optional[ParseResult] = None,
+                                         params: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+    """Concurrent version of check_parameter_for_ssrf"""
+    # Only test parameters that look like they might be URLs
+    if not (param_value.startswith('http://') or param_value.startswith('https://') or
+            param_value.startswith('//')):
+        return []
+    
+    if parsed_url is None:
+        parsed_url = urlparse(url)
+    if params is None:
+        params = parse_qsl(parsed_url.query, keep_blank_values=True)
+    payloads, probes = _parameter_probes(parsed_url, params, param_name, log_func)
+    
+    hit = await _first_successful_probe(session, semaphore, limiter, probes,
+                                        f"Error testing SSRF in parameter {param_name}", log_func)
+    if hit is None:
+        return []
+    
+    if log_func:
+        log_func(f"SSRF vulnerability found in parameter {param_name} at {url}")
+    
+    return [_parameter_vulnerability(param_name, payloads[hit], param_value)]
+
+async def check_forms_for_ssrf_async(url: str, response: requests.Response, session: 'aiohttp.ClientSession',
+                                     semaphore: asyncio.Semaphore, limiter: TokenBucket, log_func=None) -> List[Dict[str, Any]]:
+    """Concurrent version of check_forms_for_ssrf"""
+    inputs_to_test = []
+    
+    for form in extract_forms(response):
+        form_action = form.get('action', '')
+        form_method = form.get('method', 'get').lower()
+        
+        # Make form action URL absolute if it's relative
+        if form_action and not form_action.startswith(('http://', 'https://')):
+            form_action = urljoin(url, form_action)
+        
+        # If form action is empty, use the current URL
+        if not form_action:
+            form_action = url
+        
+        # Test each input in the form that might accept URLs
+        for input_field in form.get('inputs', []):
+            input_name = input_field.get('name', '')
+            input_type = input_field.get('type', '').lower()
+            
+            # Skip submit buttons and hidden fields
+            if input_type in ['submit', 'button', 'image', 'hidden']:
+                continue
+            
+            # Check if input name suggests it might accept a URL
+            if not _SSRF_PARAM_MATCHER.search(input_name):
+                continue
+            
+            payloads = []
+            probes = []
+            for payload in _FORM_PROBES:
+                # Prepare form data with our payload
+                form_data = {}
+                for field in form.get('inputs', []):
+                    field_name = field.get('name', '')
+                    if field_name == input_name:
+                        form_data[field_name] = payload
+                    elif field.get('type') not in ['submit', 'button', 'image']:
+                        # Fill other fields with dummy data
+                        form_data[field_name] = 'test'
+                
+                if log_func:
+                    log_func(f"Testing SSRF with payload: {payload} in form input {input_name}")
+                
+                payloads.append(payload)
+                if form_method == 'get':
+                    probes.append(('GET', form_action, {'params': form_data}))
+                else:
+                    probes.append(('POST', form_action, {'data': form_data}))
+            
+            inputs_to_test.append((form_action, form_method, input_name, payloads, probes))
+    
+    hits = await asyncio.gather(*(
+        _first_successful_probe(session, semaphore, limiter, probes,
+                                f"Error testing SSRF in form input {input_name}", log_func)
+        for _, _, input_name, _, probes in inputs_to_test
+    ))
+    
+    vulnerabilities = []
+    for (form_action, form_method, input_name, payloads, _), hit in zip(inputs_to_test, hits):
+        if hit is None:
+            continue
+        
+        vulnerabilities.append(_form_vulnerability(form_action, form_method, input_name, payloads[hit]))
+        
+        if log_func:
+            log_func(f"SSRF vulnerability found in form input {input_name} at {url}")
+    
+    return vulnerabilities
+
+async def _endpoint_exists(session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore, limiter: TokenBucket,
+                           endpoint_url: str) -> bool:
+    """Check with a HEAD request whether an API endpoint exists"""
+    await limiter.acquire_async()
+    async with semaphore:
+        async with session.head(endpoint_url, allow_redirects=False,
+                                timeout=aiohttp.ClientTimeout(total=HEAD_TIMEOUT)) as head_response:
+            return head_response.status not in MISSING_ENDPOINT_STATUSES
+
+async def check_api_for_ssrf_async(url: str, session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore,
+                                   limiter: TokenBucket, log_func=None,
+                                   probed_apis: Optional[Set[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+    """Concurrent version of check_api_for_ssrf"""
+    # Check if URL looks like an API endpoint
+    parsed_url = urlparse(url)
+    if not _is_api_url(parsed_url):
+        return []
+    
+    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    
+    # A cheap HEAD request per endpoint rules out the ones that do not exist
+    endpoints = _claim_api_endpoints(base_url, probed_apis)
+    exists = await asyncio.gather(*(
+        _endpoint_exists(session, semaphore, limiter, urljoin(base_url, endpoint))
+        for endpoint in endpoints
+    ), return_exceptions=True)
+    
+    endpoint_probes = []
+    for endpoint, endpoint_exists in zip(endpoints, exists):
+        if isinstance(endpoint_exists, Exception):
+            if log_func:
+                log_func(f"Error checking API endpoint {endpoint}: {str(endpoint_exists)}")
+            continue
+        if not endpoint_exists:
+            continue
+        
+        endpoint_url = urljoin(base_url, endpoint)
+        
+        # Per target: the payload as URL parameter (GET), then as JSON body (POST)
+        attempts = []
+        probes = []
+        for target in INTERNAL_TARGETS[:2]:  # Limit targets to reduce requests
+            payload = f"http://{target}/"
+            
+            if log_func:
+                log_func(f"Testing SSRF with payload: {payload} at API endpoint {endpoint}")
+            
+            attempts.append((payload, 'GET'))
+            probes.append(('GET', f"{endpoint_url}?url={payload}", {}))
+            attempts.append((payload, 'POST'))
+            probes.append(('POST', endpoint_url, {'json': {'url': payload}}))
+        
+        endpoint_probes.append((endpoint, attempts, probes))
+    
+    hits = await asyncio.gather(*(
+        _first_successful_probe(session, semaphore, limiter, probes,
+                                f"Error testing SSRF in API endpoint {endpoint}", log_func)
+        for endpoint, _, probes in endpoint_probes
+    ))
+    
+    vulnerabilities = []
+    for (endpoint, attempts, _), hit in zip(endpoint_probes, hits):
+        if hit is None:
+            continue
+        
+        payload, method = attempts[hit]
+        vulnerabilities.append(_api_vulnerability(endpoint, payload, method))
+        
+        if log_func:
+            log_func(f"SSRF vulnerability found in API endpoint {endpoint} at {url}")
+    
+    return vulnerabilities
@@ -1,13 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from collections import Counter
 from datetime import datetime
-import json
 import os
+import threading
+
+from .utils import dump_json
+
+# Write buffer of the streamed URL and vulnerability files
+STREAM_BUFFER_SIZE = 1 << 20
 
 class ScanStats:
-    def __init__(self):
+    def __init__(self, output_dir: Optional[str] = None):
+        """
+        Args:
+            output_dir: Where to stream scanned URLs and vulnerabilities while
+                the scan runs (see open_streams). Without it, or if the files
+                cannot be opened, both are kept in memory until save().
+        """
         self.start_time = datetime.now()
         self.end_time = None
         
+        # Guards every counter and stream below: checks may report from several threads
+        self._lock = threading.Lock()
+        
         # Basic metrics
         self.total_urls_scanned = 0
         self.total_requests = 0
@@ -15,7 +30,7 @@ class ScanStats:
         self.total_vulnerabilities = 0
         
         # Detailed metrics
-        self.vulnerabilities_by_type: Dict[str, int] = {
+        self.vulnerabilities_by_type: Counter = Counter({
             # Default vulnerability types
             'xss': 0,
             'sql_injection': 0,
@@ -27,56 +42,150 @@ class ScanStats:
             'crypto_failure_outdated_tls': 0,  # A02
             'insecure_design_csrf': 0,  # A04
             'insecure_design_no_rate_limiting': 0,  # A04
-        }
-        self.errors_by_type: Dict[str, int] = {}
-        self.response_codes: Dict[int, int] = {}
+        })
+        self.errors_by_type: Counter = Counter()
+        self.response_codes: Counter = Counter()
         self.scanned_urls: List[str] = []
         self.vulnerable_urls: List[Dict[str, Any]] = []
         
-        # Performance metrics
-        self.avg_response_time = 0
+        # Streams replacing the two lists above once open_streams succeeds
+        self._urls_fp = None
+        self._vulns_fp = None
+        self.streamed = False
+        if output_dir:
+            self.open_streams(output_dir)
+        
+        # Performance metrics (the average and minimum are derived on demand)
         self.total_response_time = 0
-        self.min_response_time = float('inf')
+        self._min_response_time = float('inf')
         self.max_response_time = 0
     
+    def open_streams(self, output_dir: str) -> bool:
+        """
+        Stream scanned URLs to scanned_urls.txt and vulnerabilities to
+        vulnerabilities.jsonl in output_dir from now on
+        
+        Returns False, keeping both in memory, if the files cannot be opened.
+        """
+        urls_fp = None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            urls_fp = open(os.path.join(output_dir, 'scanned_urls.txt'), 'w', buffering=STREAM_BUFFER_SIZE)
+            vulns_fp = open(os.path.join(output_dir, 'vulnerabilities.jsonl'), 'wb', buffering=STREAM_BUFFER_SIZE)
+        except OSError:
+            if urls_fp is not None:
+                urls_fp.close()
+            return False
+        
+        with self._lock:
+            # Anything recorded before the streams opened goes first
+            for url in self.scanned_urls:
+                urls_fp.write(url)
+                urls_fp.write('\n')
+            for vuln_data in self.vulnerable_urls:
+                vulns_fp.write(dump_json(vuln_data))
+                vulns_fp.write(b'\n')
+            self.scanned_urls = []
+            self.vulnerable_urls = []
+            self._urls_fp = urls_fp
+            self._vulns_fp = vulns_fp
+            self.streamed = True
+        return True
+    
     def add_url(self, url: str):
         """Add a scanned URL"""
-        self.scanned_urls.append(url)
-        self.total_urls_scanned += 1
+        with self._lock:
+            if self._urls_fp is not None:
+                self._urls_fp.write(url)
+                self._urls_fp.write('\n')
+            else:
+                self.scanned_urls.append(url)
+            self.total_urls_scanned += 1
     
     def add_vulnerability(self, vuln_type: str, url: str, details: Dict[str, Any]):
         """Add a discovered vulnerability"""
-        self.total_vulnerabilities += 1
-        self.vulnerabilities_by_type[vuln_type] = self.vulnerabilities_by_type.get(vuln_type, 0) + 1
-        
-        vuln_data = {
-            'type': vuln_type,
-            'url': url,
-            'details': details,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.vulnerable_urls.append(vuln_data)
+        with self._lock:
+            self.total_vulnerabilities += 1
+            self.vulnerabilities_by_type[vuln_type] += 1
+            
+            vuln_data = {
+                'type': vuln_type,
+                'url': url,
+                'details': details,
+                'timestamp': datetime.now().isoformat()
+            }
+            self._record_vulnerability(vuln_data)
+    
+    def add_vulnerabilities_bulk(self, vulns: List[Dict[str, Any]]):
+        """Add several discovered vulnerabilities at once"""
+        with self._lock:
+            self.total_vulnerabilities += len(vulns)
+            self.vulnerabilities_by_type.update(vuln['type'] for vuln in vulns)
+            
+            timestamp = datetime.now().isoformat()
+            for vuln in vulns:
+                self._record_vulnerability({
+                    'type': vuln['type'],
+                    'url': vuln['url'],
+                    'details': vuln,
+                    'timestamp': timestamp
+                })
+    
+    def _record_vulnerability(self, vuln_data: Dict[str, Any]):
+        """Stream a vulnerability record as one JSON line, or keep it in memory (lock held)"""
+        if self._vulns_fp is not None:
+            self._vulns_fp.write(dump_json(vuln_data))
+            self._vulns_fp.write(b'\n')
+        else:
+            self.vulnerable_urls.append(vuln_data)
     
     def add_error(self, error_type: str):
         """Add an error"""
-        self.total_errors += 1
-        self.errors_by_type[error_type] = self.errors_by_type.get(error_type, 0) + 1
+        with self._lock:
+            self.total_errors += 1
+            self.errors_by_type[error_type] += 1
     
     def add_response(self, status_code: int, response_time: float):
         """Add a response"""
-        self.total_requests += 1
-        self.response_codes[status_code] = self.response_codes.get(status_code, 0) + 1
-        
-        # Update response time metrics
-        self.total_response_time += response_time
-        self.avg_response_time = self.total_response_time / self.total_requests
-        self.min_response_time = min(self.min_response_time, response_time)
-        self.max_response_time = max(self.max_response_time, response_time)
+        with self._lock:
+            self.total_requests += 1
+            self.response_codes[status_code] += 1
+            
+            # Update response time metrics
+            self.total_response_time += response_time
+            self._min_response_time = min(self._min_response_time, response_time)
+            self.max_response_time = max(self.max_response_time, response_time)
+    
+    @property
+    def avg_response_time(self) -> float:
+        """Average response time, 0 before any response"""
+        return self.total_response_time / self.total_requests if self.total_requests else 0
+    
+    @property
+    def min_response_time(self) -> float:
+        """Fastest response time, 0 (not infinity) before any response"""
+        return self._min_response_time if self.total_requests else 0
     
     def complete(self):
         """Mark scan as complete"""
         self.end_time = datetime.now()
     
+    def flush(self):
+        """Flush the streamed URL and vulnerability files"""
+        with self._lock:
+            for fp in (self._urls_fp, self._vulns_fp):
+                if fp is not None:
+                    fp.flush()
+    
+    def close(self):
+        """Flush and close the streamed files"""
+        with self._lock:
+            for fp in (self._urls_fp, self._vulns_fp):
+                if fp is not None:
+                    fp.close()
+            self._urls_fp = None
+            self._vulns_fp = None
+    
     def get_duration(self) -> float:
         """Get scan duration in seconds"""
         if not self.end_time:
@@ -84,36 +193,42 @@ class ScanStats:
         return (self.end_time - self.start_time).total_seconds()
     
     def get_summary(self) -> Dict[str, Any]:
-        """Get scan summary"""
-        return {
-            'start_time': self.start_time.isoformat(),
-            'end_time': self.end_time.isoformat() if self.end_time else None,
-            'duration': self.get_duration(),
-            'total_urls_scanned': self.total_urls_scanned,
-            'total_requests': self.total_requests,
-            'total_errors': self.total_errors,
-            'total_vulnerabilities': self.total_vulnerabilities,
-            'vulnerabilities_by_type': self.vulnerabilities_by_type,
-            'errors_by_type': self.errors_by_type,
-            'response_codes': self.response_codes,
-            'performance': {
-                'avg_response_time': self.avg_response_time,
-                'min_response_time': self.min_response_time,
-                'max_response_time': self.max_response_time
+        """Get scan summary, a consistent snapshot taken while briefly holding the lock"""
+        with self._lock:
+            return {
+                'start_time': self.start_time.isoformat(),
+                'end_time': self.end_time.isoformat() if self.end_time else None,
+                'duration': self.get_duration(),
+                'total_urls_scanned': self.total_urls_scanned,
+                'total_requests': self.total_requests,
+                'total_errors': self.total_errors,
+                'total_vulnerabilities': self.total_vulnerabilities,
+                'vulnerabilities_by_type': dict(self.vulnerabilities_by_type),
+                'errors_by_type': dict(self.errors_by_type),
+                'response_codes': dict(self.response_codes),
+                'performance': {
+                    'avg_response_time': self.avg_response_time,
+                    'min_response_time': self.min_response_time,
+                    'max_response_time': self.max_response_time
+                }
             }
-        }
     
     def save(self, output_dir: str):
         """Save scan statistics to files"""
         os.makedirs(output_dir, exist_ok=True)
         
         # Save summary
-        with open(os.path.join(output_dir, 'scan_summary.json'), 'w') as f:
-            json.dump(self.get_summary(), f, indent=4)
+        with open(os.path.join(output_dir, 'scan_summary.json'), 'wb') as f:
+            f.write(dump_json(self.get_summary(), indent=True))
+        
+        # Streamed URLs and vulnerabilities are already on disk
+        if self.streamed:
+            self.flush()
+            return
         
         # Save vulnerable URLs
-        with open(os.path.join(output_dir, 'vulnerabilities.json'), 'w') as f:
-            json.dump(self.vulnerable_urls, f, indent=4)
+        with open(os.path.join(output_dir, 'vulnerabilities.json'), 'wb') as f:
+            f.write(dump_json(self.vulnerable_urls, indent=True))
         
         # Save scanned URLs
         with open(os.path.join(output_dir, 'scanned_urls.txt'), 'w') as f:
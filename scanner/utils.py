@@ -1,15 +1,125 @@
+import functools
 import re
 import urllib.parse
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import hashlib
 import json
 from datetime import datetime
+from types import MappingProxyType
+from .matchers import LiteralMatcher, RegexSet
+from .session import create_pooled_session
 
+# lxml is a much faster (C) parser for BeautifulSoup; html.parser is the stdlib fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# selectolax (lexbor backend) pulls tag attributes far faster than any soup, so it
+# is used where only attributes are read; BeautifulSoup is the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# Only these subtrees are built into a soup, the rest of the page is skipped while parsing
+_LINK_TAGS = SoupStrainer(['a', 'link', 'script', 'img'])
+_FORM_TAGS = SoupStrainer('form')
+
+# xxhash is optional - fall back to a short BLAKE2b digest without it
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Characters of a str body encoded per step when hashing it
+HASH_CHUNK_CHARS = 64 * 1024
+
+# orjson is optional - it serializes straight to bytes and much faster than json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Shared keep-alive session for helpers that make their own requests - use
+# SESSION.get(...) instead of requests.get(...) so connections are reused
+SESSION_POOL_SIZE = 32
+SESSION = create_pooled_session(SESSION_POOL_SIZE)
+
+# Common SQL error messages
+SQL_ERRORS = [
+    'SQL syntax',
+    'mysql_fetch_array',
+    'mysql_fetch_assoc',
+    'mysql_num_rows',
+    'mysql_result',
+    'mysql_query',
+    'mysql error',
+    'ORA-',
+    'SQLite/JDBCDriver',
+    'SQLite.Exception',
+    'System.Data.SQLite.SQLiteException',
+    'Warning: mysql_',
+    'valid PostgreSQL result',
+    'Npgsql.',
+    'Microsoft SQL Server',
+    'ODBC SQL Server Driver',
+    'SQLServer JDBC Driver',
+    'com.microsoft.sqlserver.jdbc',
+    'SQLServerException',
+    'SQLServer JDBC Driver',
+    'SQLServerDriver',
+    'SQLServer',
+    'SQLite/JDBCDriver',
+    'SQLite.Exception',
+    'System.Data.SQLite.SQLiteException',
+    'Warning: mysql_',
+    'valid MySQL result',
+    'Unknown column',
+    'MySqlClient.',
+    'com.mysql.jdbc.exceptions'
+]
+
+# SQL error messages that need a regular expression
+SQL_ERROR_REGEXES = [
+    'PostgreSQL.*ERROR',
+    'Warning.*pg_',
+    'check the manual that corresponds to your (MySQL|MariaDB) server version'
+]
+
+# Built once so every response is scanned for all errors in a single pass each
+_SQL_ERROR_MATCHER = LiteralMatcher(SQL_ERRORS)
+_SQL_ERROR_REGEX_MATCHER = RegexSet(SQL_ERROR_REGEXES)
+
+# Only the start of a response is searched for SQL errors
+MAX_SQL_ERROR_SCAN_BYTES = 256 * 1024
+# Only the start of a response is searched for a reflected XSS payload
+MAX_XSS_SCAN_CHARS = 256 * 1024
+
+# URLs repeat heavily across a crawl (same hosts, same pages linked from every page),
+# so parsing and the helpers below are memoized
+URL_CACHE_SIZE = 65536
+
+_cached_urlparse = functools.lru_cache(maxsize=URL_CACHE_SIZE)(urllib.parse.urlparse)
+# Navigation and asset links repeat on every page of a site, so (base, href) pairs recur
+_cached_urljoin = functools.lru_cache(maxsize=URL_CACHE_SIZE)(urllib.parse.urljoin)
+
+def absolutize_url(base_url: str, href: str) -> str:
+    """Resolve href against base_url, returning absolute http(s) URLs untouched"""
+    if href.startswith(('http://', 'https://')):
+        return href
+    return _cached_urljoin(base_url, href)
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
 def normalize_url(url: str) -> str:
     """Normalize URL by removing fragments and normalizing path"""
-    parsed = urllib.parse.urlparse(url)
+    parsed = _cached_urlparse(url)
     # Remove fragment
     parsed = parsed._replace(fragment='')
     # Normalize path
@@ -22,44 +132,60 @@ def normalize_url(url: str) -> str:
     parsed = parsed._replace(path=path)
     return urllib.parse.urlunparse(parsed)
 
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
 def is_valid_url(url: str) -> bool:
     """Check if URL is valid"""
+    if not isinstance(url, str):
+        return False
     try:
-        result = urllib.parse.urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
+        result = _cached_urlparse(url)
+    except ValueError:
+        # The only error urlparse raises on a str, e.g. a malformed IPv6 host
         return False
+    return bool(result.scheme and result.netloc)
 
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
 def get_base_url(url: str) -> str:
     """Get base URL (scheme + netloc)"""
-    parsed = urllib.parse.urlparse(url)
+    parsed = _cached_urlparse(url)
     return f"{parsed.scheme}://{parsed.netloc}"
 
 def is_same_domain(url1: str, url2: str) -> bool:
     """Check if two URLs belong to the same domain"""
-    return get_base_url(url1) == get_base_url(url2)
+    return _cached_urlparse(url1).netloc == _cached_urlparse(url2).netloc
 
 def extract_links(html: str, base_url: str) -> List[str]:
     """Extract all links from HTML content"""
-    soup = BeautifulSoup(html, 'html.parser')
-    links = []
+    if HAS_SELECTOLAX:
+        attrs = (node.attributes for node in SelectolaxParser(html).css('a, link, script, img'))
+    else:
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_LINK_TAGS)
+        attrs = (tag.attrs for tag in soup.find_all(['a', 'link', 'script', 'img']))
+    links = set()
+    seen = set()
+    base_netloc = _cached_urlparse(base_url).netloc
     
-    for tag in soup.find_all(['a', 'link', 'script', 'img']):
-        href = tag.get('href') or tag.get('src')
-        if href:
-            # Handle relative URLs
-            if not href.startswith(('http://', 'https://')):
-                href = urllib.parse.urljoin(base_url, href)
-            # Remove fragments and normalize
-            href = normalize_url(href)
-            if is_valid_url(href) and is_same_domain(href, base_url):
-                links.append(href)
+    for tag_attrs in attrs:
+        href = tag_attrs.get('href') or tag_attrs.get('src')
+        # Pages repeat the same references; each distinct one is resolved once
+        if not href or href in seen:
+            continue
+        seen.add(href)
+        # Handle relative URLs
+        href = absolutize_url(base_url, href)
+        # Normalizing keeps the host, so off-domain links are dropped before it
+        if _cached_urlparse(href).netloc != base_netloc:
+            continue
+        # Remove fragments and normalize
+        href = normalize_url(href)
+        if is_valid_url(href):
+            links.add(href)
     
-    return list(set(links))  # Remove duplicates
+    return list(links)
 
 def extract_forms(html: str, base_url: str) -> List[Dict]:
     """Extract all forms from HTML content"""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_FORM_TAGS)
     forms = []
     
     for form in soup.find_all('form'):
@@ -90,33 +216,68 @@ def extract_forms(html: str, base_url: str) -> List[Dict]:
     
     return forms
 
-def generate_hash(content: str) -> str:
-    """Generate SHA-256 hash of content"""
-    return hashlib.sha256(content.encode()).hexdigest()
+def _new_hasher():
+    if HAS_XXHASH:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+def generate_hash_bytes(data: Union[bytes, memoryview]) -> str:
+    """Hash raw bytes (e.g. response.content) without copying them"""
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def generate_hash(content: Union[str, bytes]) -> str:
+    """Generate a fast non-cryptographic 64-bit hex digest of content for dedup keys"""
+    if not isinstance(content, str):
+        return generate_hash_bytes(content)
+    if len(content) <= HASH_CHUNK_CHARS:
+        return generate_hash_bytes(content.encode())
+
+    # Encode large bodies piecewise so a full UTF-8 copy is never held at once;
+    # UTF-8 is stateless, so the digest matches hashing content.encode()
+    hasher = _new_hasher()
+    for start in range(0, len(content), HASH_CHUNK_CHARS):
+        hasher.update(content[start:start + HASH_CHUNK_CHARS].encode())
+    return hasher.hexdigest()
+
+def generate_url_key(url: str) -> int:
+    """Generate a 64-bit integer key for URL dedup sets"""
+    data = url.encode()
+    if HAS_XXHASH:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+# One name=value pair of a Cookie header; pieces without '=' never match
+_COOKIE_RE = re.compile(r'\s*([^;=]*)=([^;]*?)\s*(?:;|$)')
 
 def parse_cookies(cookie_str: str) -> Dict[str, str]:
     """Parse cookie string into dictionary"""
-    cookies = {}
-    if cookie_str:
-        for cookie in cookie_str.split(';'):
-            if '=' in cookie:
-                name, value = cookie.strip().split('=', 1)
-                cookies[name] = value
-    return cookies
+    return dict(_COOKIE_RE.findall(cookie_str)) if cookie_str else {}
 
 def format_timestamp(timestamp: datetime) -> str:
     """Format timestamp for logging"""
     return timestamp.strftime('%Y-%m-%d %H:%M:%S')
 
+def dump_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, with orjson when it is installed"""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=str, option=option)
+    if indent:
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+
 def save_json(data: Dict, filename: str):
     """Save data to JSON file"""
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+    with open(filename, 'wb') as f:
+        f.write(dump_json(data, indent=True))
 
 def load_json(filename: str) -> Dict:
     """Load data from JSON file"""
-    with open(filename, 'r') as f:
-        return json.load(f)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
 
 def get_response_time(response: requests.Response) -> float:
     """Get response time in seconds"""
@@ -134,39 +295,44 @@ def get_error_type(response: requests.Response) -> str:
         return 'client_error'
     return 'unknown'
 
+# Security headers checked on every response, built once at import. Read-only
+# because the info mappings are handed to callers in extract_headers' result
+_SECURITY_HEADERS = {
+    'X-Frame-Options': {
+        'description': 'Protects against clickjacking attacks',
+        'consequences': 'Without this header, attackers could embed your site in a malicious webpage and trick users into clicking on elements they didn\'t intend to, potentially leading to unwanted actions or data theft.'
+    },
+    'X-Content-Type-Options': {
+        'description': 'Prevents MIME-sniffing attacks',
+        'consequences': 'Without this header, browsers might interpret files as a different type than what you intended, allowing attackers to potentially execute malicious scripts even when they shouldn\'t be executable.'
+    },
+    'X-XSS-Protection': {
+        'description': 'Provides protection against cross-site scripting',
+        'consequences': 'Without this header, malicious scripts could be injected into your webpage and execute in users\' browsers, potentially stealing cookies, session tokens, or other sensitive information.'
+    },
+    'Content-Security-Policy': {
+        'description': 'Controls resources the browser is allowed to load',
+        'consequences': 'Without this header, your site could load resources from any source, making it vulnerable to script injection attacks that could compromise user data or take control of page behavior.'
+    },
+    'Strict-Transport-Security': {
+        'description': 'Forces HTTPS connections',
+        'consequences': 'Without this header, communications between your site and users might be downgraded to insecure HTTP, allowing attackers to intercept and modify data in transit, or perform man-in-the-middle attacks.'
+    },
+    'Referrer-Policy': {
+        'description': 'Controls how much referrer information is included with requests',
+        'consequences': 'Without this header, sensitive information might be leaked in the referrer header when users navigate from your site to other sites, potentially exposing private data or user activity.'
+    }
+}
+SECURITY_HEADERS = MappingProxyType({
+    header: MappingProxyType(info) for header, info in _SECURITY_HEADERS.items()
+})
+
 def extract_headers(response: requests.Response) -> Dict[str, Dict]:
     """Extract security-related headers from response and identify missing ones"""
-    security_headers = {
-        'X-Frame-Options': {
-            'description': 'Protects against clickjacking attacks',
-            'consequences': 'Without this header, attackers could embed your site in a malicious webpage and trick users into clicking on elements they didn\'t intend to, potentially leading to unwanted actions or data theft.'
-        },
-        'X-Content-Type-Options': {
-            'description': 'Prevents MIME-sniffing attacks',
-            'consequences': 'Without this header, browsers might interpret files as a different type than what you intended, allowing attackers to potentially execute malicious scripts even when they shouldn\'t be executable.'
-        },
-        'X-XSS-Protection': {
-            'description': 'Provides protection against cross-site scripting',
-            'consequences': 'Without this header, malicious scripts could be injected into your webpage and execute in users\' browsers, potentially stealing cookies, session tokens, or other sensitive information.'
-        },
-        'Content-Security-Policy': {
-            'description': 'Controls resources the browser is allowed to load',
-            'consequences': 'Without this header, your site could load resources from any source, making it vulnerable to script injection attacks that could compromise user data or take control of page behavior.'
-        },
-        'Strict-Transport-Security': {
-            'description': 'Forces HTTPS connections',
-            'consequences': 'Without this header, communications between your site and users might be downgraded to insecure HTTP, allowing attackers to intercept and modify data in transit, or perform man-in-the-middle attacks.'
-        },
-        'Referrer-Policy': {
-            'description': 'Controls how much referrer information is included with requests',
-            'consequences': 'Without this header, sensitive information might be leaked in the referrer header when users navigate from your site to other sites, potentially exposing private data or user activity.'
-        }
-    }
-    
     found_headers = {}
     missing_headers = {}
     
-    for header, info in security_headers.items():
+    for header, info in SECURITY_HEADERS.items():
         if header in response.headers:
             found_headers[header] = response.headers[header]
         else:
@@ -184,46 +350,16 @@ def is_vulnerable_to_xss(response: requests.Response, payload: str) -> bool:
         return is_vulnerable_to_xss_advanced(response, payload)
     except ImportError:
         # Fallback to basic detection if the advanced module isn't available
-        return payload in response.text
+        return payload in response.text[:MAX_XSS_SCAN_CHARS]
 
 def is_vulnerable_to_sql_injection(response: requests.Response, payload: str) -> bool:
     """Check if response indicates SQL injection vulnerability"""
-    # Common SQL error messages
-    sql_errors = [
-        'SQL syntax',
-        'mysql_fetch_array',
-        'mysql_fetch_assoc',
-        'mysql_num_rows',
-        'mysql_result',
-        'mysql_query',
-        'mysql error',
-        'ORA-',
-        'SQLite/JDBCDriver',
-        'SQLite.Exception',
-        'System.Data.SQLite.SQLiteException',
-        'Warning: mysql_',
-        'PostgreSQL.*ERROR',
-        'Warning.*pg_',
-        'valid PostgreSQL result',
-        'Npgsql.',
-        'Microsoft SQL Server',
-        'ODBC SQL Server Driver',
-        'SQLServer JDBC Driver',
-        'com.microsoft.sqlserver.jdbc',
-        'SQLServerException',
-        'SQLServer JDBC Driver',
-        'SQLServerDriver',
-        'SQLServer',
-        'SQLite/JDBCDriver',
-        'SQLite.Exception',
-        'System.Data.SQLite.SQLiteException',
-        'Warning: mysql_',
-        'valid MySQL result',
-        'check the manual that corresponds to your (MySQL|MariaDB) server version',
-        'Unknown column',
-        'MySqlClient.',
-        'com.mysql.jdbc.exceptions'
-    ]
-    
-    content = response.text.lower()
-    return any(error.lower() in content for error in sql_errors)
+    # response.text decodes the whole body (and may sniff its charset) on every
+    # access; only the scanned prefix is decoded here. The error signatures
+    # are ASCII, so latin-1 is a safe default when no charset was declared
+    head = response.content[:MAX_SQL_ERROR_SCAN_BYTES]
+    try:
+        text = head.decode(response.encoding or 'latin-1', 'ignore')
+    except LookupError:
+        text = head.decode('latin-1')
+    return _SQL_ERROR_MATCHER.search(text) or _SQL_ERROR_REGEX_MATCHER.search(text)
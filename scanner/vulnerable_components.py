@@ -1,12 +1,25 @@
 """
 A06 - Vulnerable and Outdated Components Scanner Module
 """
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import requests
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import os
+import threading
+
+from .utils import HAS_SELECTOLAX, HTML_PARSER, absolutize_url
+
+if HAS_SELECTOLAX:
+    from .utils import SelectolaxParser
+
+# packaging understands every PEP 440 version; without it versions are compared as int tuples
+try:
+    from packaging.version import Version, InvalidVersion
+    HAS_PACKAGING = True
+except ImportError:
+    HAS_PACKAGING = False
 
 # Define a database of known vulnerable library versions
 # Format: {'library_name': {'versions': ['version1', 'version2'], 'cve': 'CVE-ID', 'description': 'Vulnerability description'}}
@@ -70,8 +83,21 @@ VULNERABLE_LIBRARIES = {
 }
 
 # Load additional vulnerabilities from a local database if available
+# The database file is read once, on first use rather than at import
+_database_loaded = False
+_database_lock = threading.Lock()
+
 def load_vulnerability_database():
-    """Load vulnerability database from a local file if available"""
+    """Load vulnerability database from a local file if available (only the first call does any work)"""
+    global _database_loaded
+    if _database_loaded:
+        return
+    with _database_lock:
+        if not _database_loaded:
+            _load_vulnerability_database()
+            _database_loaded = True
+
+def _load_vulnerability_database():
     try:
         db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'vulnerable_libraries.json')
         if os.path.exists(db_path):
@@ -80,15 +106,41 @@ def load_vulnerability_database():
                 # Merge with the built-in database
                 for lib, data in additional_db.items():
                     if lib in VULNERABLE_LIBRARIES:
-                        # Merge versions
-                        VULNERABLE_LIBRARIES[lib]['versions'].extend(data.get('versions', []))
+                        # Merge versions, dropping ones already listed
+                        versions = VULNERABLE_LIBRARIES[lib]['versions'] + data.get('versions', [])
+                        VULNERABLE_LIBRARIES[lib]['versions'] = list(dict.fromkeys(versions))
                     else:
                         VULNERABLE_LIBRARIES[lib] = data
     except Exception as e:
         print(f"Error loading vulnerability database: {str(e)}")
+    
+    _index_vulnerable_versions()
 
-# Call to load additional vulnerabilities
-load_vulnerability_database()
+def _parse_version(version: str):
+    """Return a comparable form of version, or None if it can't be parsed"""
+    if HAS_PACKAGING:
+        try:
+            return Version(version)
+        except InvalidVersion:
+            return None
+    try:
+        parts = [int(part) for part in version.split('.')]
+    except ValueError:
+        return None
+    # 4.17 and 4.17.0 are the same version
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+# library -> (exact vulnerable versions, newest parseable vulnerable version)
+_VULNERABLE_VERSION_INDEX: Dict[str, Tuple[frozenset, Any]] = {}
+
+def _index_vulnerable_versions():
+    """Precompute the lookups check_library_vulnerability needs for every library"""
+    _VULNERABLE_VERSION_INDEX.clear()
+    for lib, lib_info in VULNERABLE_LIBRARIES.items():
+        parsed = [v for v in (_parse_version(version) for version in lib_info.get('versions', [])) if v is not None]
+        _VULNERABLE_VERSION_INDEX[lib] = (frozenset(lib_info.get('versions', [])), max(parsed) if parsed else None)
 
 def check_vulnerable_components(url: str, response: requests.Response, log_func=None) -> List[Dict[str, Any]]:
     """
@@ -102,16 +154,16 @@ def check_vulnerable_components(url: str, response: requests.Response, log_func=
     Returns:
         List of vulnerabilities found
     """
+    load_vulnerability_database()
     vulnerabilities = []
     
     if log_func:
         log_func(f"Checking vulnerable components for {url}")
     
-    # Extract scripts and stylesheets
-    scripts, stylesheets = extract_external_resources(response)
-    
-    # Check scripts for vulnerable versions
-    for script_url in scripts:
+    # Check scripts for vulnerable versions as they are found in the page
+    for kind, script_url in _iter_external_resources(response):
+        if kind != 'script':
+            continue
         library_name, version = identify_library_version(script_url)
         
         if library_name and version:
@@ -140,6 +192,36 @@ def check_vulnerable_components(url: str, response: requests.Response, log_func=
     
     return vulnerabilities
 
+# Scripts and stylesheets are the only tags extract_external_resources looks at
+_RESOURCE_TAGS = SoupStrainer(['script', 'link'])
+
+def _iter_external_resources(response: requests.Response) -> Iterator[Tuple[str, str]]:
+    """Yield ('script' or 'stylesheet', absolute URL) pairs from a single pass over the page"""
+    base_url = response.url
+    
+    try:
+        if HAS_SELECTOLAX:
+            tree = SelectolaxParser(response.text)
+            resources = (
+                ('script', node.attributes.get('src')) if node.tag == 'script' else ('stylesheet', node.attributes.get('href'))
+                for node in tree.css('script[src], link[rel~="stylesheet"][href]')
+            )
+        else:
+            soup = BeautifulSoup(response.text, HTML_PARSER, parse_only=_RESOURCE_TAGS)
+            resources = (
+                ('script', tag.get('src')) if tag.name == 'script' else ('stylesheet', tag.get('href'))
+                for tag in soup.find_all(['script', 'link'])
+                if tag.name == 'script' or 'stylesheet' in (tag.get('rel') or [])
+            )
+        
+        for kind, resource_url in resources:
+            if resource_url:
+                # Normalize URL if it's relative
+                yield kind, absolutize_url(base_url, resource_url)
+    
+    except Exception as e:
+        print(f"Error extracting resources: {str(e)}")
+
 def extract_external_resources(response: requests.Response) -> Tuple[List[str], List[str]]:
     """
     Extract external script and stylesheet URLs from a response
@@ -153,40 +235,52 @@ def extract_external_resources(response: requests.Response) -> Tuple[List[str],
     scripts = []
     stylesheets = []
     
-    try:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract scripts
-        for script in soup.find_all('script', src=True):
-            src = script.get('src', '')
-            if src:
-                # Normalize URL if it's relative
-                if not src.startswith(('http://', 'https://')):
-                    if src.startswith('//'):
-                        src = 'https:' + src
-                    else:
-                        base_url = response.url
-                        src = base_url.rstrip('/') + '/' + src.lstrip('/')
-                scripts.append(src)
-        
-        # Extract stylesheets
-        for link in soup.find_all('link', rel='stylesheet', href=True):
-            href = link.get('href', '')
-            if href:
-                # Normalize URL if it's relative
-                if not href.startswith(('http://', 'https://')):
-                    if href.startswith('//'):
-                        href = 'https:' + href
-                    else:
-                        base_url = response.url
-                        href = base_url.rstrip('/') + '/' + href.lstrip('/')
-                stylesheets.append(href)
-    
-    except Exception as e:
-        print(f"Error extracting resources: {str(e)}")
+    for kind, resource_url in _iter_external_resources(response):
+        if kind == 'script':
+            scripts.append(resource_url)
+        else:
+            stylesheets.append(resource_url)
     
     return scripts, stylesheets
 
+# Common library name and version patterns in URLs, as (pattern, library) pairs;
+# the version is the pattern's {version} placeholder
+LIBRARY_VERSION_PATTERNS = [
+    # jquery-X.Y.Z.min.js
+    (r'jquery[.-]{version}', 'jquery'),
+    # bootstrap.min.js?v=X.Y.Z or bootstrap-X.Y.Z.min.js
+    (r'bootstrap[.-]?{version}', 'bootstrap'),
+    # angular.min.js?v=X.Y.Z or angular-X.Y.Z.min.js
+    (r'angular[.-]?{version}', 'angular'),
+    # react.min.js?v=X.Y.Z or react-X.Y.Z.min.js
+    (r'react[.-]?{version}', 'react'),
+    # vue.min.js?v=X.Y.Z or vue-X.Y.Z.min.js
+    (r'vue[.-]?{version}', 'vue'),
+    # lodash.min.js?v=X.Y.Z or lodash-X.Y.Z.min.js
+    (r'lodash[.-]?{version}', 'lodash'),
+    # moment.min.js?v=X.Y.Z or moment-X.Y.Z.min.js
+    (r'moment[.-]?{version}', 'moment'),
+    # Look for version in query string v=X.Y.Z
+    (r'[?&]v={version}', None),
+    # Look for version in query string version=X.Y.Z
+    (r'[?&]version={version}', None)
+]
+
+# A version number X.Y or X.Y.Z, captured in the named group <group>_version
+_VERSION_GROUP = r'(?P<{group}_version>\d+\.\d+(?:\.\d+)?)'
+
+# All patterns fused into one regex: pattern i is the named group p<i>. Each
+# sits in a lookahead tried from the start of the URL, so the first pattern in
+# list order that occurs anywhere wins, not the leftmost match
+_LIBRARY_VERSION_RE = re.compile(
+    '(?:' + '|'.join(
+        f"(?=.*?(?P<p{idx}>{pattern.format(version=_VERSION_GROUP.format(group=f'p{idx}'))}))"
+        for idx, (pattern, _) in enumerate(LIBRARY_VERSION_PATTERNS)
+    ) + ')',
+    re.IGNORECASE | re.DOTALL
+)
+_LIBRARY_BY_GROUP = {f"p{idx}": library for idx, (_, library) in enumerate(LIBRARY_VERSION_PATTERNS)}
+
 def identify_library_version(url: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Identify library name and version from a URL
@@ -196,39 +290,21 @@ def identify_library_version(url: str) -> Tuple[Optional[str], Optional[str]]:
     
     Returns:
         Tuple of (library_name, version) or (None, None) if not identified
-    """
-    # Common library name and version patterns in URLs
-    patterns = [
-        # jquery-X.Y.Z.min.js
-        (r'jquery[.-](\d+\.\d+(?:\.\d+)?)', 'jquery'),
-        # bootstrap.min.js?v=X.Y.Z or bootstrap-X.Y.Z.min.js
-        (r'bootstrap[.-]?(\d+\.\d+(?:\.\d+)?)', 'bootstrap'),
-        # angular.min.js?v=X.Y.Z or angular-X.Y.Z.min.js
-        (r'angular[.-]?(\d+\.\d+(?:\.\d+)?)', 'angular'),
-        # react.min.js?v=X.Y.Z or react-X.Y.Z.min.js
-        (r'react[.-]?(\d+\.\d+(?:\.\d+)?)', 'react'),
-        # vue.min.js?v=X.Y.Z or vue-X.Y.Z.min.js
-        (r'vue[.-]?(\d+\.\d+(?:\.\d+)?)', 'vue'),
-        # lodash.min.js?v=X.Y.Z or lodash-X.Y.Z.min.js
-        (r'lodash[.-]?(\d+\.\d+(?:\.\d+)?)', 'lodash'),
-        # moment.min.js?v=X.Y.Z or moment-X.Y.Z.min.js
-        (r'moment[.-]?(\d+\.\d+(?:\.\d+)?)', 'moment'),
-        # Look for version in query string v=X.Y.Z
-        (r'[?&]v=(\d+\.\d+(?:\.\d+)?)', None),
-        # Look for version in query string version=X.Y.Z
-        (r'[?&]version=(\d+\.\d+(?:\.\d+)?)', None)
-    ]
     
+    Patterns are tried in LIBRARY_VERSION_PATTERNS order, so the file name
+    wins over a library named earlier in the path:
+    
+    >>> identify_library_version('https://x/bootstrap-4.0.0/js/jquery-3.2.1.min.js')
+    ('jquery', '3.2.1')
+    """
     library_name = None
     version = None
     
-    for pattern, lib in patterns:
-        match = re.search(pattern, url, re.IGNORECASE)
-        if match:
-            if lib:
-                library_name = lib
-            version = match.group(1)
-            break
+    # One anchored match over all patterns; the named group that matched tells which pattern it was
+    match = _LIBRARY_VERSION_RE.match(url)
+    if match:
+        library_name = _LIBRARY_BY_GROUP[match.lastgroup]
+        version = match.group(f"{match.lastgroup}_version")
     
     # If we found a version but no library name, try to identify the library
     if version and not library_name:
@@ -250,46 +326,24 @@ def check_library_vulnerability(library: str, version: str) -> Optional[Dict[str
     Returns:
         Vulnerability info if vulnerable, None otherwise
     """
+    load_vulnerability_database()
     if library.lower() not in VULNERABLE_LIBRARIES:
         return None
     
     lib_info = VULNERABLE_LIBRARIES[library.lower()]
+    exact_versions, newest_vulnerable = _VULNERABLE_VERSION_INDEX[library.lower()]
     
     # Check if this exact version is in the vulnerable versions list
-    if version in lib_info['versions']:
+    if version in exact_versions:
         return lib_info
     
-    # If not, do a smart comparison to check if this version is older than the newest vulnerable version
-    try:
-        # Parse version numbers
-        version_parts = [int(part) for part in version.split('.')]
-        
-        # Check against each vulnerable version
-        for vuln_version in lib_info['versions']:
-            try:
-                vuln_version_parts = [int(part) for part in vuln_version.split('.')]
-                
-                # Compare version numbers
-                is_older = False
-                for i in range(max(len(version_parts), len(vuln_version_parts))):
-                    v1 = version_parts[i] if i < len(version_parts) else 0
-                    v2 = vuln_version_parts[i] if i < len(vuln_version_parts) else 0
-                    
-                    if v1 < v2:
-                        is_older = True
-                        break
-                    elif v1 > v2:
-                        is_older = False
-                        break
-                
-                if not is_older:
-                    # This version is newer or the same as the vulnerable version
-                    return lib_info
-            except:
-                # If we can't parse the vulnerable version, skip it
-                continue
-    except:
+    # If not, check whether this version is not newer than the newest vulnerable version
+    parsed_version = _parse_version(version)
+    if parsed_version is None:
         # If we can't parse the version, be cautious and return as vulnerable
         return lib_info
     
+    if newest_vulnerable is not None and parsed_version <= newest_vulnerable:
+        return lib_info
+    
     return None
@@ -3,15 +3,22 @@ XSS Scanner Module - Enhanced Reflected XSS Detection
 This module provides advanced functions to detect reflected XSS vulnerabilities.
 """
 
+import functools
 import re
 import html
+import html.entities
 import random
 import string
 import requests
-from typing import Dict, List, Any, Tuple, Optional
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from typing import Callable, Dict, List, Any, NamedTuple, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, ParseResult
 import bs4
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .matchers import LiteralMatcher
+from .ratelimit import TokenBucket
+from .utils import HTML_PARSER, MAX_XSS_SCAN_CHARS
 
 # List of XSS payloads for testing
 XSS_PAYLOADS = [
@@ -38,6 +45,9 @@ XSS_PAYLOADS = [
     "<audio src=1 onerror=alert(1)>",
 ]
 
+# HTML-escaped form of each payload, looked up by is_payload_reflected_encoded
+ENCODED_PAYLOADS = {payload: html.escape(payload) for payload in XSS_PAYLOADS}
+
 # Test cases that indicate successful XSS exploitation
 XSS_INDICATORS = [
     "<script>",
@@ -69,6 +79,45 @@ def generate_unique_payload() -> Tuple[str, str]:
     unique_marker = f"xss{random_id}"
     return f"<script>alert('{unique_marker}')</script>", unique_marker
 
+def get_text(response: requests.Response) -> str:
+    """
+    Decode a response body once and keep the text on the response object
+    
+    requests decodes (and, without a declared charset, sniffs) the body again
+    on every response.text access; the XSS checks read it several times.
+    """
+    text = getattr(response, '_cached_text', None)
+    if text is None:
+        text = response._cached_text = response.text
+    return text
+
+# ASCII characters that must encode to the same single bytes for a raw-body search to be exact
+_ASCII_PROBE = ''.join(chr(code) for code in range(0x20, 0x7f))
+
+@functools.lru_cache(maxsize=64)
+def _is_ascii_compatible(encoding: Optional[str]) -> bool:
+    """True if encoding maps printable ASCII to the same bytes (not UTF-16, UTF-7, EBCDIC, ...)"""
+    if not encoding:
+        return False
+    try:
+        return _ASCII_PROBE.encode(encoding) == _ASCII_PROBE.encode('ascii')
+    except (LookupError, UnicodeError):
+        return False
+
+def body_contains(response: requests.Response, needle: str) -> bool:
+    """
+    Check whether needle occurs in the decoded response body
+    
+    An ASCII needle is first looked for in the raw bytes, which rules out a
+    miss without decoding the body. Hits are confirmed on the decoded text
+    since multi-byte charsets such as Shift_JIS reuse ASCII byte values.
+    """
+    if (getattr(response, '_cached_text', None) is None and needle.isascii()
+            and _is_ascii_compatible(response.encoding)
+            and needle.encode('ascii') not in response.content):
+        return False
+    return needle in get_text(response)
+
 def is_payload_reflected_exact(response: requests.Response, payload: str) -> bool:
     """
     Check if a payload is reflected exactly as-is in the response
@@ -80,7 +129,7 @@ def is_payload_reflected_exact(response: requests.Response, payload: str) -> boo
     Returns:
         True if the payload is reflected without modification, False otherwise
     """
-    return payload in response.text
+    return body_contains(response, payload)
 
 def is_payload_reflected_encoded(response: requests.Response, payload: str) -> bool:
     """
@@ -93,8 +142,60 @@ def is_payload_reflected_encoded(response: requests.Response, payload: str) -> b
     Returns:
         True if the encoded payload is found, False otherwise
     """
-    encoded_payload = html.escape(payload)
-    return encoded_payload in response.text and payload not in response.text
+    encoded_payload = ENCODED_PAYLOADS.get(payload)
+    if encoded_payload is None:
+        encoded_payload = html.escape(payload)
+    return body_contains(response, encoded_payload) and payload not in get_text(response)
+
+def get_soup(response: requests.Response) -> BeautifulSoup:
+    """
+    Parse a response once and keep the soup on the response object
+    
+    Callers must treat the returned soup as read-only since it is shared.
+    """
+    soup = getattr(response, '_cached_soup', None)
+    if soup is None:
+        soup = response._cached_soup = BeautifulSoup(get_text(response), HTML_PARSER)
+    return soup
+
+_SCRIPT_OPEN_RE = re.compile(r'<script', re.IGNORECASE)
+# A start tag with its attributes; quoted values may contain '>', and a stray
+# quote is taken as a plain character so broken markup still ends at '>'
+_START_TAG_RE = re.compile(r'<[A-Za-z](?:[^>"\']|"[^"]*"|\'[^\']*\'|["\'])*')
+
+# Named entities (with and without the trailing ';') by each character they decode to
+_ENTITY_NAMES_BY_CHAR: Dict[str, List[str]] = {}
+for _name, _value in html.entities.html5.items():
+    for _char in set(_value):
+        _ENTITY_NAMES_BY_CHAR.setdefault(_char, []).append(_name)
+
+def _marker_entity_re(marker: str) -> 're.Pattern[str]':
+    """
+    Build a regex for the character references that could decode to a character
+    of marker: any numeric reference, and the named entities of its characters
+    """
+    names = {name for char in set(marker) for name in _ENTITY_NAMES_BY_CHAR.get(char, ())}
+    alternatives = [r'#(?:[0-9]|[xX][0-9a-fA-F])'] + [re.escape(name) for name in sorted(names)]
+    return re.compile('&(?:' + '|'.join(alternatives) + ')')
+
+def _may_be_in_attribute(text: str, marker: str) -> bool:
+    """
+    Return False only when no attribute value can contain marker: no start
+    tag holds it literally, and none has an entity that could decode to one
+    of its characters (so '&amp;' in query strings doesn't count, unless the
+    marker itself has an '&')
+    """
+    entity_re = None
+    for match in _START_TAG_RE.finditer(text):
+        tag = match.group()
+        if marker in tag:
+            return True
+        if '&' in tag:
+            if entity_re is None:
+                entity_re = _marker_entity_re(marker)
+            if entity_re.search(tag):
+                return True
+    return False
 
 def detect_context(response: requests.Response, marker: str) -> List[str]:
     """
@@ -108,34 +209,75 @@ def detect_context(response: requests.Response, marker: str) -> List[str]:
         List of contexts in which the marker was found
     """
     contexts = []
-    if marker not in response.text:
+    text = get_text(response)
+    if marker not in text:
         return contexts
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # The whole tree is needed: the html context below serializes all of it
+    soup = get_soup(response)
     
-    # Check for script context
-    scripts = soup.find_all('script')
-    for script in scripts:
-        if script.string and marker in script.string:
-            contexts.append('script')
-            break
+    # Check for script context (there are no script tags without a literal "<script")
+    if _SCRIPT_OPEN_RE.search(text):
+        scripts = soup.find_all('script')
+        for script in scripts:
+            if script.string and marker in script.string:
+                contexts.append('script')
+                break
     
-    # Check for attribute context
-    for tag in soup.find_all(True):
-        for attr_name, attr_value in tag.attrs.items():
-            if isinstance(attr_value, str) and marker in attr_value:
-                contexts.append(f'attribute:{attr_name}')
+    # Check for attribute context, walking every tag only if some tag could hold the marker
+    if _may_be_in_attribute(text, marker):
+        for tag in soup.find_all(True):
+            for attr_name, attr_value in tag.attrs.items():
+                if isinstance(attr_value, str) and marker in attr_value:
+                    contexts.append(f'attribute:{attr_name}')
     
     # Check for HTML context
     if marker in str(soup):
         contexts.append('html')
     
     # Check for URL context
-    if f"href=\"{marker}\"" in response.text or f"src=\"{marker}\"" in response.text:
+    if f"href=\"{marker}\"" in text or f"src=\"{marker}\"" in text:
         contexts.append('url')
     
     return contexts
 
+class XssFinding(NamedTuple):
+    """A reflected payload found by scan_url_parameters"""
+    url: str
+    parameter: str
+    payload: str
+    reflection_type: str
+    contexts: List[str]
+    waf_detected: bool
+
+def findings_to_columns(findings: List[XssFinding]) -> Dict[str, list]:
+    """Turn findings into one list per field, e.g. for bulk serialization"""
+    return {field: [getattr(finding, field) for finding in findings] for field in XssFinding._fields}
+
+# Maximum number of payloads scan_url_parameters tests at once for a parameter
+XSS_CONCURRENCY = 8
+
+# Bytes of each probe response scan_url_parameters downloads; reflections
+# land near the top of a page, and the rest of a large body is never read
+MAX_SCAN_BYTES = 128 * 1024
+
+# Phrases of WAF block pages, matched case-insensitively in one pass
+WAF_INDICATORS = [
+    "security block",
+    "blocked for security reasons",
+    "attack detected",
+    "firewall",
+    "WAF",
+    "mod_security",
+    "forbidden",
+    "suspicious activity",
+    "malicious request",
+]
+_WAF_MATCHER = LiteralMatcher(WAF_INDICATORS)
+
+# Status codes WAFs commonly answer a blocked request with
+WAF_STATUS_CODES = frozenset({403, 406, 429, 501})
+
 def check_for_waf_block(response: requests.Response) -> bool:
     """
     Check if the response indicates a Web Application Firewall block
@@ -146,27 +288,19 @@ def check_for_waf_block(response: requests.Response) -> bool:
     Returns:
         True if WAF block is detected, False otherwise
     """
-    waf_indicators = [
-        "security block",
-        "blocked for security reasons",
-        "attack detected",
-        "firewall",
-        "WAF",
-        "mod_security",
-        "forbidden",
-        "suspicious activity",
-        "malicious request",
-    ]
-    
-    for indicator in waf_indicators:
-        if indicator.lower() in response.text.lower():
-            return True
-    
-    # Check for common WAF response codes
-    if response.status_code in [403, 406, 429, 501]:
+    # The status code is checked first so block pages are not searched at all
+    if response.status_code in WAF_STATUS_CODES:
         return True
     
-    return False
+    return _WAF_MATCHER.search(get_text(response))
+
+# Lowercase <script> tags are rewritten by the case and comment bypasses below
+_SCRIPT_TAG_RE = re.compile(r'<script>', re.IGNORECASE | re.ASCII)
+
+# Angle-bracket encodings applied in one pass each by bypass_simple_filters
+_ENTITY_ENCODE = str.maketrans({"<": "&lt;", ">": "&gt;"})
+_URL_ENCODE = str.maketrans({"<": "%3C", ">": "%3E"})
+_DOUBLE_URL_ENCODE = str.maketrans({"<": "%253C", ">": "%253E"})
 
 def bypass_simple_filters(payload: str) -> List[str]:
     """
@@ -178,31 +312,45 @@ def bypass_simple_filters(payload: str) -> List[str]:
     Returns:
         List of bypass payload variants
     """
+    variants = BYPASS_VARIANTS.get(payload)
+    if variants is not None:
+        return list(variants)
+    return _bypass_variants(payload)
+
+def _bypass_variants(payload: str) -> List[str]:
+    """Build the bypass variants of payload (see bypass_simple_filters)"""
     bypass_variants = []
+    has_script_tag = _SCRIPT_TAG_RE.search(payload) is not None
     
     # Case variation
-    if "<script>" in payload.lower():
+    if has_script_tag:
         bypass_variants.append(payload.replace("<script>", "<ScRiPt>").replace("</script>", "</ScRiPt>"))
     
     # Entity encoding
     if "<" in payload:
-        bypass_variants.append(payload.replace("<", "&lt;").replace(">", "&gt;"))
+        bypass_variants.append(payload.translate(_ENTITY_ENCODE))
     
     # URL encoding
-    bypass_variants.append(payload.replace("<", "%3C").replace(">", "%3E"))
+    bypass_variants.append(payload.translate(_URL_ENCODE))
     
     # Double encoding
-    bypass_variants.append(payload.replace("<", "%253C").replace(">", "%253E"))
+    bypass_variants.append(payload.translate(_DOUBLE_URL_ENCODE))
     
     # Null byte
     bypass_variants.append(payload.replace("<script>", "<script\x00>"))
     
     # Spaces to comments
-    if "<script>" in payload.lower():
+    if has_script_tag:
         bypass_variants.append(payload.replace("<script>", "<script/**//>"))
     
     return bypass_variants
 
+# Bypass variants of the built-in payloads, built once; callers get a fresh list each time
+BYPASS_VARIANTS = {payload: tuple(_bypass_variants(payload)) for payload in XSS_PAYLOADS}
+
+# Form controls are the only tags extract_input_fields reads; options stay inside their select
+_INPUT_TAGS = SoupStrainer(['input', 'textarea', 'select'])
+
 def extract_input_fields(html_content: str) -> List[Dict[str, str]]:
     """
     Extract all input fields from an HTML page
@@ -214,7 +362,7 @@ def extract_input_fields(html_content: str) -> List[Dict[str, str]]:
         List of dictionaries containing input field details
     """
     inputs = []
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=_INPUT_TAGS)
     
     # Find all input elements
     for input_tag in soup.find_all('input'):
@@ -263,16 +411,26 @@ def extract_input_fields(html_content: str) -> List[Dict[str, str]]:
     
     return inputs
 
-def scan_url_parameters(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+def scan_url_parameters(url: str, session: requests.Session,
+                        concurrency: int = XSS_CONCURRENCY,
+                        limiter: Optional[TokenBucket] = None) -> List[XssFinding]:
     """
     Scan URL parameters for XSS vulnerabilities
     
+    The payloads for a parameter are tested from a thread pool instead of one
+    after another. The result is the same as testing them in order: the first
+    payload (in XSS_PAYLOADS order) that is reflected wins, and payloads after
+    it that have not started yet are cancelled.
+    
     Args:
         url: URL to scan
-        session: HTTP session object
+        session: HTTP session object, shared by the worker threads
+        concurrency: Maximum number of payloads tested at once
+        limiter: Token bucket throttling the probe requests, shared with the
+            other probes of the scan; unthrottled if None
         
     Returns:
-        List of detected XSS vulnerabilities
+        List of detected XSS vulnerabilities, at most one per parameter
     """
     vulnerabilities = []
     parsed_url = urlparse(url)
@@ -282,82 +440,128 @@ def scan_url_parameters(url: str, session: requests.Session) -> List[Dict[str, A
     if not query_params:
         return vulnerabilities
     
-    for param_name, param_values in query_params.items():
-        original_value = param_values[0]
-        
-        # Test multiple payloads
-        for payload in XSS_PAYLOADS:
-            # Create a copy of the original query parameters
-            modified_params = parse_qs(parsed_url.query)
-            
-            # Replace the target parameter with the XSS payload
-            modified_params[param_name] = [payload]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for param_name in query_params:
+            # A payload that encodes to an already queued URL would only repeat its request
+            with_param = _param_url_builder(parsed_url, query_params, param_name)
+            probes: Dict[str, str] = {}
+            for payload in XSS_PAYLOADS:
+                probes.setdefault(with_param(payload), payload)
             
-            # Rebuild the URL with the modified query
-            new_query = urlencode(modified_params, doseq=True)
-            new_url_parts = list(parsed_url)
-            new_url_parts[4] = new_query
-            new_url = urlunparse(new_url_parts)
+            futures = [
+                executor.submit(_test_url_parameter, session, with_param, param_name, payload, new_url, limiter)
+                for new_url, payload in probes.items()
+            ]
             
-            try:
-                # Send request with the modified URL
-                response = session.get(new_url, allow_redirects=True)
-                
-                # Check if the payload is reflected in the response
-                if is_payload_reflected_exact(response, payload):
-                    contexts = detect_context(response, payload)
-                    
-                    vulnerability = {
-                        'url': new_url,
-                        'parameter': param_name,
-                        'payload': payload,
-                        'reflection_type': 'exact',
-                        'contexts': contexts,
-                        'waf_detected': check_for_waf_block(response)
-                    }
-                    
+            # Walk the results in payload order so the earliest reflected payload is reported
+            for index, future in enumerate(futures):
+                vulnerability = future.result()
+                if vulnerability:
                     vulnerabilities.append(vulnerability)
                     # No need to test more payloads for this parameter
+                    for pending in futures[index + 1:]:
+                        pending.cancel()
                     break
-                
-                # Generate a unique payload
-                unique_payload, marker = generate_unique_payload()
-                
-                # Test with unique payload
-                modified_params[param_name] = [unique_payload]
-                new_query = urlencode(modified_params, doseq=True)
-                new_url_parts[4] = new_query
-                unique_url = urlunparse(new_url_parts)
-                
-                unique_response = session.get(unique_url, allow_redirects=True)
-                
-                # Check if the unique marker is reflected
-                if marker in unique_response.text:
-                    contexts = detect_context(unique_response, marker)
-                    
-                    vulnerability = {
-                        'url': unique_url,
-                        'parameter': param_name,
-                        'payload': unique_payload,
-                        'reflection_type': 'marker',
-                        'contexts': contexts,
-                        'waf_detected': check_for_waf_block(unique_response)
-                    }
-                    
-                    vulnerabilities.append(vulnerability)
-                    break
-                
-            except Exception as e:
-                print(f"Error scanning URL parameter {param_name}: {str(e)}")
     
     return vulnerabilities
 
-def analyze_xss_vulnerability(vulnerability: Dict[str, Any]) -> Dict[str, Any]:
+def _param_url_builder(parsed_url: ParseResult, query_params: Dict[str, List[str]],
+                       param_name: str) -> Callable[[str], str]:
+    """
+    Return a function rebuilding the URL with param_name set to a value and the
+    other parameters unchanged
+    
+    The URL around the parameter is encoded once; each call only encodes the
+    new value and joins the three pieces.
+    """
+    # urlencode joins the encoded parameters with '&' in order, so encoding the
+    # parameters before and after the target separately gives the same query
+    names = list(query_params)
+    position = names.index(param_name)
+    before = urlencode({name: query_params[name] for name in names[:position]}, doseq=True)
+    after = urlencode({name: query_params[name] for name in names[position + 1:]}, doseq=True)
+    
+    # The query is never empty here, so urlunparse would always add the '?'
+    head = urlunparse(parsed_url._replace(query='', fragment='')) + '?'
+    tail = f"#{parsed_url.fragment}" if parsed_url.fragment else ''
+    
+    def with_param(value: str) -> str:
+        query = '&'.join(part for part in (before, urlencode({param_name: value}), after) if part)
+        return f"{head}{query}{tail}"
+    
+    return with_param
+
+def _get_head(session: requests.Session, url: str, limiter: Optional[TokenBucket] = None) -> requests.Response:
+    """
+    GET url and keep only the first MAX_SCAN_BYTES of the body
+    
+    The truncated body becomes response.content, so every later check on the
+    response sees the same bytes. The connection is closed rather than
+    drained when the body is longer. With a limiter, a token is taken first.
+    """
+    if limiter is not None:
+        limiter.acquire()
+    response = session.get(url, allow_redirects=True, stream=True)
+    try:
+        # decode_content undoes gzip/deflate, so the limit applies to the decoded body
+        response._content = response.raw.read(MAX_SCAN_BYTES, decode_content=True) or b''
+    finally:
+        response.close()
+    return response
+
+def _test_url_parameter(session: requests.Session, with_param: Callable[[str], str],
+                        param_name: str, payload: str, new_url: str,
+                        limiter: Optional[TokenBucket] = None) -> Optional[XssFinding]:
+    """Test one payload (already placed in new_url), followed by a unique-marker payload if it isn't reflected"""
+    try:
+        # Send request with the modified URL
+        response = _get_head(session, new_url, limiter)
+        
+        # Check if the payload is reflected in the response
+        if is_payload_reflected_exact(response, payload):
+            contexts = detect_context(response, payload)
+            
+            return XssFinding(
+                url=new_url,
+                parameter=param_name,
+                payload=payload,
+                reflection_type='exact',
+                contexts=contexts,
+                waf_detected=check_for_waf_block(response)
+            )
+        
+        # Generate a unique payload
+        unique_payload, marker = generate_unique_payload()
+        
+        # Test with unique payload
+        unique_url = with_param(unique_payload)
+        
+        unique_response = _get_head(session, unique_url, limiter)
+        
+        # Check if the unique marker is reflected
+        if body_contains(unique_response, marker):
+            contexts = detect_context(unique_response, marker)
+            
+            return XssFinding(
+                url=unique_url,
+                parameter=param_name,
+                payload=unique_payload,
+                reflection_type='marker',
+                contexts=contexts,
+                waf_detected=check_for_waf_block(unique_response)
+            )
+        
+    except Exception as e:
+        print(f"Error scanning URL parameter {param_name}: {str(e)}")
+    
+    return None
+
+def analyze_xss_vulnerability(vulnerability: XssFinding) -> Dict[str, Any]:
     """
     Analyze an XSS vulnerability and provide detailed information
     
     Args:
-        vulnerability: Dictionary containing vulnerability details
+        vulnerability: Finding returned by scan_url_parameters
         
     Returns:
         Enhanced vulnerability information
@@ -367,24 +571,32 @@ def analyze_xss_vulnerability(vulnerability: Dict[str, Any]) -> Dict[str, Any]:
         'severity': 'High',
         'recommendation': 'Implement proper output encoding and input validation',
         'type': 'reflected_xss',
-        'parameter': vulnerability.get('parameter', ''),
-        'payload': vulnerability.get('payload', ''),
-        'reflection_type': vulnerability.get('reflection_type', ''),
-        'contexts': vulnerability.get('contexts', []),
+        'parameter': vulnerability.parameter,
+        'payload': vulnerability.payload,
+        'reflection_type': vulnerability.reflection_type,
+        'contexts': vulnerability.contexts,
         'consequences': 'Attackers can inject malicious JavaScript that executes in users\' browsers, allowing them to steal cookies and session tokens, capture keystrokes, redirect users to fake websites, or perform actions on behalf of the victim. This could lead to account takeover, data theft, or spreading malware to your users.'
     }
     
     # Adjust severity based on context
-    if 'script' in vulnerability.get('contexts', []):
+    if 'script' in vulnerability.contexts:
         details['severity'] = 'Critical'
         details['description'] = 'Critical XSS vulnerability - Direct script execution possible'
     
     # Add WAF detection information
-    if vulnerability.get('waf_detected', False):
+    if vulnerability.waf_detected:
         details['notes'] = 'Web Application Firewall detected but not preventing the XSS attack'
     
     return details
 
+# All XSS indicators in one automaton; like the original `in` tests it is case-sensitive
+_XSS_INDICATOR_MATCHER = LiteralMatcher(XSS_INDICATORS, ignore_case=False)
+
+@functools.lru_cache(maxsize=1024)
+def _payload_indicator_ids(payload: str) -> frozenset:
+    """Ids (in _XSS_INDICATOR_MATCHER) of the XSS indicators that occur in payload"""
+    return frozenset(_XSS_INDICATOR_MATCHER.match_ids(payload))
+
 def is_vulnerable_to_xss_advanced(response: requests.Response, payload: str) -> bool:
     """
     Advanced check for XSS vulnerability in response
@@ -396,24 +608,41 @@ def is_vulnerable_to_xss_advanced(response: requests.Response, payload: str) ->
     Returns:
         True if vulnerable, False otherwise
     """
-    # Check for exact payload reflection
-    if payload in response.text:
-        # If payload contains script tags or event handlers, check they're not encoded
-        for indicator in XSS_INDICATORS:
-            if indicator in payload and indicator in response.text:
-                # Check it's not inside a textarea, code or pre block
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove all textarea, code and pre elements
-                for tag in soup.find_all(['textarea', 'code', 'pre']):
-                    tag.decompose()
-                
-                # Check if payload exists in remaining HTML
-                cleaned_html = str(soup)
-                if indicator in cleaned_html:
-                    return True
-    
-    return False
+    # If payload contains script tags or event handlers, check they're not encoded.
+    # An indicator taken from a reflected payload is in the text by definition
+    indicator_ids = _payload_indicator_ids(payload)
+    
+    # Check for exact payload reflection; most responses fail this without being decoded
+    if not indicator_ids or not body_contains(response, payload):
+        return False
+    text = get_text(response)[:MAX_XSS_SCAN_CHARS]
+    if payload not in text:
+        return False
+    
+    # Check it's not inside a textarea, code or pre block.
+    # html.parser on purpose: lxml drops misplaced tags such as a reflected
+    # <body onload=...>, which browsers still honour. This only runs once a
+    # payload is reflected, so speed matters less
+    soup = BeautifulSoup(text, 'html.parser')
+    
+    # Remove all textarea, code and pre elements
+    for tag in soup.find_all(['textarea', 'code', 'pre']):
+        tag.decompose()
+    
+    # Check if payload exists in remaining HTML
+    return not indicator_ids.isdisjoint(_XSS_INDICATOR_MATCHER.match_ids(str(soup)))
+
+# Payload markers used to classify a finding; re.ASCII keeps the folding
+# identical to str.lower() for these ASCII-only needles
+_XSS_TYPE_RE = re.compile(r'<script>|onerror|onload|javascript:', re.IGNORECASE | re.ASCII)
+_XSS_TYPES = {
+    '<script>': 'script tag',
+    'onerror': 'event handler',
+    'onload': 'event handler',
+    'javascript:': 'javascript URI',
+}
+# A payload carrying several markers is reported as the first type listed here
+_XSS_TYPE_PRECEDENCE = ('script tag', 'event handler', 'javascript URI')
 
 def get_xss_details(response: requests.Response, payload: str, parameter: str = None) -> Dict[str, Any]:
     """
@@ -439,13 +668,7 @@ def get_xss_details(response: requests.Response, payload: str, parameter: str =
         details['parameter'] = parameter
     
     # Determine the type of XSS based on payload
-    if "<script>" in payload.lower():
-        details['xss_type'] = 'script tag'
-    elif "onerror" in payload.lower() or "onload" in payload.lower():
-        details['xss_type'] = 'event handler'
-    elif "javascript:" in payload.lower():
-        details['xss_type'] = 'javascript URI'
-    else:
-        details['xss_type'] = 'other'
+    found = {_XSS_TYPES[marker.lower()] for marker in _XSS_TYPE_RE.findall(payload)}
+    details['xss_type'] = next((xss_type for xss_type in _XSS_TYPE_PRECEDENCE if xss_type in found), 'other')
     
     return details
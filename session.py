@@ -1,6 +1,6 @@
 # crawler/session.py
 
-import requests
+from scanner.session import create_pooled_session
 
 class ScannerSession:
     """
@@ -8,13 +8,14 @@ class ScannerSession:
     """
 
     def __init__(self):
-        self.session = requests.Session()
+        # Keep-alive pool sized for concurrent payload requests, with light retries
+        self.session = create_pooled_session()
         # TODO: load any auth tokens or headers here
 
     def get(self, url: str, **kwargs):
-        return self.session.get(url, timeout=kwargs.get("timeout"))
+        return self.session.get(url, **kwargs)
 
     def post(self, url: str, data=None, **kwargs):
-        return self.session.post(url, data=data, timeout=kwargs.get("timeout"))
+        return self.session.post(url, data=data, **kwargs)
 
     # TODO: add login() method later
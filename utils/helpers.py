@@ -1,23 +1,54 @@
+import functools
 import json
 import os
 from urllib.parse import urlparse
 from tldextract import extract
 
+# orjson is optional - save_to_json falls back to the json module without it
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 def save_to_json(data, file_path):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if HAS_ORJSON:
+        # orjson only indents by two spaces; non-str keys are stringified like json.dump does
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with open(file_path, "w") as f:
         json.dump(data, f, indent=4)
 
+# Links are checked by the thousand against a handful of hosts, so parsing and
+# public-suffix lookups are memoized
+CACHE_SIZE = 65536
+
+_cached_urlparse = functools.lru_cache(maxsize=CACHE_SIZE)(urlparse)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _registered_domain(location):
+    return extract(location).registered_domain
+
+def _domain_key(url):
+    # tldextract gives the same answer for a netloc as for its whole URL; URLs
+    # without a scheme have no netloc and are looked up whole
+    return _cached_urlparse(url).netloc or url
+
 def is_same_domain(url1, url2):
     """Check if two URLs belong to the same domain."""
-    domain1 = extract(url1).registered_domain
-    domain2 = extract(url2).registered_domain
-    return domain1 == domain2
+    key1 = _domain_key(url1)
+    key2 = _domain_key(url2)
+    if key1 == key2:
+        return True
+    return _registered_domain(key1) == _registered_domain(key2)
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def is_valid_link(url):
     """Check if a URL is valid and not a file or mailto link."""
     try:
-        parsed = urlparse(url)
+        parsed = _cached_urlparse(url)
         return bool(parsed.netloc) and not url.startswith(('mailto:', 'tel:', 'javascript:'))
     except:
         return False